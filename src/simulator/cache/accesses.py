@@ -1,4 +1,5 @@
 import abc
+from operator import attrgetter
 from typing import Any, Callable, cast, Iterable, Iterator, Optional, Sequence, Sized, TypeVar, Reversible
 from typing_extensions import Protocol, runtime_checkable
 
@@ -123,8 +124,10 @@ def scope_to_cache_processor(cache_proc: int, access_reader: SimpleAssignmentRea
 	# except:
 	# 	return GenericScoper(cache_proc, access_reader)
 
+_get_access: Callable[[AccessAssignment], Access] = attrgetter('access')
+
 def filter_cache_processor(cache_proc: int, it: Iterable[AccessAssignment]) -> Iterator[Access]:
 	return map(
-		lambda assgnm: assgnm.access,
+		_get_access,
 		filter(lambda assgnm: assgnm.cache_proc == cache_proc, it),
 	)
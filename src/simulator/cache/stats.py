@@ -65,6 +65,20 @@ class TotalStats(stats.TotalStats):
 		self.bytes_added: BytesSize = 0
 		self.bytes_removed: BytesSize = 0
 
+	@property
+	def byte_hit_rate(self) -> float:
+		"""Fraction of accessed bytes which were hit, 0.0 before any access.
+		"""
+		total = self.total_bytes_accessed
+		return self.bytes_hit / total if total else 0.0
+
+	@property
+	def byte_miss_rate(self) -> float:
+		"""Fraction of accessed bytes which were missed, 0.0 before any access.
+		"""
+		total = self.total_bytes_accessed
+		return self.bytes_missed / total if total else 0.0
+
 	def reset(self) -> None:
 		super(TotalStats, self).reset()
 		self.files_hit = 0
@@ -257,7 +271,7 @@ class MissOnFirstReaccessFilter(object):
 			if file_stats.last_residency_end <= file_stats.last_residency_begin:
 				marked_files[file_stats.id] = {
 					part_stats.ind: (part_stats.unique_bytes_accessed, 0)
-					for part_stats in file_stats.parts
+					for part_stats in file_stats.parts.values()
 				}
 
 		return marked_files
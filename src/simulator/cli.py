@@ -29,7 +29,7 @@ from .distributor import (
 )
 from .distributor.stats import AssignmentsStatsCollector
 
-from .dstructures.accessseq import change_to_active_bytes, change_to_active_files, FullReuseIndex
+from .dstructures.accessseq import active_files_changes, change_to_active_bytes, FullReuseIndex
 
 from . import recorder
 
@@ -55,6 +55,13 @@ from .cache.algorithms.size import Size
 from .params import parse_user_args, SimpleField
 from .utils import consume
 
+def _take_until(it: Iterable[AccessAssignment], time: int) -> Iterator[AccessAssignment]:
+	# Faster than itertools.takewhile with a lambda predicate
+	for assgnm in it:
+		if assgnm.access.access_ts > time:
+			return
+		yield assgnm
+
 def filter_accesses_stop_early(
 	it: Iterable[AccessAssignment],
 	time: Optional[int],
@@ -67,8 +74,7 @@ def filter_accesses_stop_early(
 	# I.e. as soon as any limit is surpassed, iteration is ended.
 
 	if time is not None:
-		t: int = time # for some reason this is required by mypy
-		it = itertools.takewhile(lambda assgnm: assgnm.access.access_ts <= t, it)
+		it = _take_until(it, time)
 
 	if accesses is not None:
 		it = itertools.islice(it, accesses)
@@ -122,6 +128,13 @@ class StopEarlyPredicate(recorder.Predicate):
 
 		return True
 
+	def key_range(self) -> Tuple[Callable[[AccessAssignment], int], int, int]:
+		# Only a time limit can be located by binary search, access time
+		# stamps are non-decreasing. The limit is inclusive.
+		if self._time is None or self._accesses is not None:
+			raise NotImplementedError
+		return (lambda assgnm: assgnm.access.access_ts), 0, self._time + 1
+
 	def take_while_not(self, it: Iterator[AccessAssignment]) -> Iterator[AccessAssignment]:
 		return iter([])
 
@@ -189,11 +202,11 @@ def record(args: Any) -> None:
 
 		cache_processors_counter = CacheProcessorsCounter(stats_collector)
 
-		recorder.record_path(args.file_path, cache_processors_counter)
+		recorder.record_path(args.file_path, cache_processors_counter, binary=args.binary)
 
 		write_workload_summary_stats_as_csv(stats_collector.stats, cache_processors_counter.count, args.summary_stats_file)
 	else:
-		recorder.record_path(args.file_path, assignment_it)
+		recorder.record_path(args.file_path, assignment_it, binary=args.binary)
 
 def tasks_from_args(args: Any) -> Sequence[Task]:
 	if args.model == 'pags':
@@ -223,7 +236,7 @@ def replay(args: Any) -> None:
 		cache_sys.reset_after_warm_up()
 
 	if args.cache_info_file_path is not None:
-		recorder.record_access_info_path(args.cache_info_file_path, cache_sys)
+		recorder.record_access_info_path(args.cache_info_file_path, cache_sys, binary=args.binary_cache_info)
 	else:
 		consume(cache_sys)
 
@@ -447,10 +460,9 @@ def write_yield_accesses_stats_as_csv(
 		'active_bytes',
 	])
 
-	active_files = 0
+	active_files_it = itertools.accumulate(active_files_changes(full_reuse_index))
 	active_bytes = 0
-	for ind, assignment in enumerate(it):
-		active_files += change_to_active_files(full_reuse_index, ind)
+	for ind, (assignment, active_files) in enumerate(zip(it, active_files_it)):
 		active_bytes += change_to_active_bytes(full_reuse_index, ind)
 
 		writer.writerow([
@@ -534,7 +546,7 @@ def write_bytes_stats_as_csv(counters: WorkloadStatsCounters, stats_file: TextIO
 
 	for file_key, part_stats in ((file_stats.id, part_stats)
 		for file_stats in counters.files_stats
-		for part_stats in file_stats.parts
+		for _, part_stats in sorted(file_stats.parts.items())
 	):
 		writer.writerow([
 			file_key,
@@ -556,6 +568,7 @@ parser_record.add_argument('--model-params-file', required=True, type=argparse.F
 parser_record.add_argument('--nodes-configuration', type=str, help='Configuration parameters for constructing the specification of the worker nodes of the cluster.')
 parser_record.add_argument('--seed', type=int, help='Seed for initialising the pseudo-random number generator. If not passed a seed is chosen by the python default behaviour.')
 parser_record.add_argument('--summary-stats-file', type=argparse.FileType('w'), help='output file to which summary stats about the entire access sequence (headers and one row) are written as CSV.')
+parser_record.add_argument('--binary', action='store_true', help='write the accesses in the binary format instead of JSON lines. Reading commands detect the format automatically.')
 
 parser_replay = subparsers.add_parser('replay', help='Perform cache algorithms on a recorded sequence of accesses.')
 parser_replay.add_argument('-f', '--file', required=True, type=str, dest='file_path', help='input file from which the accesses are read.')
@@ -570,6 +583,7 @@ parser_replay.add_argument('--storage-size', required=True, type=int, help='size
 parser_replay.add_argument('--non-shared-storage', action='store_false', dest='shared_storage', help='each cache processor receives its own storage volume if set.')
 parser_replay.add_argument('--cache-info-file', type=str, dest='cache_info_file_path', help='output file to which cache info data is written, i.e. hit and miss info for each access.')
 parser_replay.add_argument('--summary-stats-file', type=argparse.FileType('w'), help='output file to which summary stats about the cache system (headers and one row) are written as CSV.')
+parser_replay.add_argument('--binary-cache-info', action='store_true', help='write the cache info data in the binary format instead of JSON lines.')
 
 parser_convert_accesses_to_monitoring = subparsers.add_parser('convert-accesses-to-monitoring', help='Converts a file of access sequences to the same format as used for monitoring data (job trace).')
 parser_convert_accesses_to_monitoring.add_argument('-f', '--file', required=True, type=argparse.FileType('r'), help='input file from which the accesses are read.')
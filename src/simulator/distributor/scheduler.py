@@ -163,9 +163,8 @@ class AccessScheduler(object):
 		except IndexError:
 			# PQ is empty, retrieve next job assignment...
 			# May throw StopIteration which is propagated upwards
-			job_assignment = self._assignment_it.next()
+			ts, job_assignment = self._assignment_it.next_with_ts()
 			self._push_assignment(job_assignment)
-			ts = job_assignment.start_ts
 
 		while True:
 			try:
@@ -1,45 +1,40 @@
 from array import array
-import itertools
 import math
-from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+import operator
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
 from ..cache.accesses import SimpleAccessReader
 from ..workload import Access, BytesSize, FileID, PartInd, PartSpec
 
 
+_inf = math.inf
+
 class ReuseTimer(object):
 	def __init__(self, accesses: SimpleAccessReader) -> None:
 		self._reuse_ind: array[int] = self._build_reuse_ind(accesses)
+		self._len: int = len(self._reuse_ind)
 
 	def __len__(self) -> int:
-		return len(self._reuse_ind)
+		return self._len
 
 	def __iter__(self) -> Iterator[int]:
 		return iter(self._reuse_ind)
 
 	def reuse_time(self, ind: int) -> Optional[int]:
-		if self._reuse_ind[ind] >= len(self._reuse_ind):
-			return None
-
-		return self._reuse_ind[ind] - ind
+		reuse_ind = self._reuse_ind[ind]
+		return None if reuse_ind >= self._len else reuse_ind - ind
 
 	def reuse_time_inf(self, ind: int) -> Union[int, float]:
-		if self._reuse_ind[ind] >= len(self._reuse_ind):
-			return math.inf
-
-		return self._reuse_ind[ind] - ind
+		reuse_ind = self._reuse_ind[ind]
+		return _inf if reuse_ind >= self._len else reuse_ind - ind
 
 	def reuse_ind(self, ind: int) -> Optional[int]:
-		if self._reuse_ind[ind] >= len(self._reuse_ind):
-			return None
-
-		return self._reuse_ind[ind]
+		reuse_ind = self._reuse_ind[ind]
+		return None if reuse_ind >= self._len else reuse_ind
 
 	def reuse_ind_inf(self, ind: int) -> Union[int, float]:
-		if self._reuse_ind[ind] >= len(self._reuse_ind):
-			return math.inf
-
-		return self._reuse_ind[ind]
+		reuse_ind = self._reuse_ind[ind]
+		return _inf if reuse_ind >= self._len else reuse_ind
 
 	def reuse_ind_len(self, ind: int) -> int:
 		return self._reuse_ind[ind]
@@ -56,7 +51,7 @@ class ReuseTimer(object):
 	def _build_reuse_ind(accesses: SimpleAccessReader) -> 'array[int]':
 		next_access: Dict[FileID, int] = {}
 		accesses_length = len(accesses)
-		reuse_ind: 'array[int]' = array('Q', itertools.repeat(0, accesses_length))
+		reuse_ind: 'array[int]' = array('Q', (0,)) * accesses_length
 
 		for rev_ind, access in enumerate(reversed(accesses)):
 			ind = accesses_length - rev_ind - 1
@@ -70,13 +65,22 @@ class FullReuseIndex(object):
 	"""Builds and provides access to a full index of file re-uses.
 	"""
 
+	_meta_rows: int = 5
+
 	def __init__(self, accesses: SimpleAccessReader) -> None:
+		# All per-access columns are rows of a single array, _meta, which is
+		# allocated once with _meta_rows * len(accesses) elements. Each of the
+		# column attributes below is a memoryview onto one row of _meta.
+		self._meta: array[int]
 		# Next or previous use index for the same file
 		# If there is no following index to ind:
 		# _*_use_ind[ind] >= len(_*_use_ind)
-		self._prev_use_ind: array[int]
-		self._next_use_ind: array[int]
-		self._access_ts: array[int]
+		self._prev_use_ind: memoryview[int]
+		self._next_use_ind: memoryview[int]
+		self._access_ts: memoryview[int]
+		# _file_id[ind] is a dense integer id of the file accessed at ind,
+		# assigned in order of first access.
+		self._file_id: memoryview[int]
 		# _parts_offset describes which indices in _parts and _part_sizes are
 		# associated with access ind i:
 		# _parts[range(
@@ -85,66 +89,43 @@ class FullReuseIndex(object):
 		# )]
 		# And analogously for _part_sizes.
 		# (_parts[i], _part_sizes[i]) give the full PartSpec.
-		self._parts_offset: array[int]
+		self._parts_offset: memoryview[int]
 		self._parts: array[int]
 		self._part_sizes: array[BytesSize]
 
+		self._meta, self._parts, self._part_sizes = self._build(accesses)
+
 		(
 			self._prev_use_ind,
 			self._next_use_ind,
 			self._access_ts,
+			self._file_id,
 			self._parts_offset,
-			self._parts,
-			self._part_sizes,
-		) = self._build(accesses)
-
-		parts_offset = self._parts_offset
-		parts_length = len(self._parts)
-		def parts_range(ind: int) -> range:
-			"""Returns the range of indices of the parts of the access at ``ind``.
+		) = self._meta_columns(self._meta)
 
-			"Fast" method.
-			"""
-			start = parts_offset[ind]
-			end: int
-			try:
-				end = parts_offset[ind + 1]
-			except IndexError:
-				end = parts_length
-
-			return range(start, end)
-
-		self._parts_range: Callable[[int], range] = parts_range
+		self._len: int = len(self._prev_use_ind)
 
 	def __len__(self) -> int:
-		return len(self._prev_use_ind)
+		return self._len
 
 	def prev_use_ind(self, ind: int) -> Optional[int]:
-		if self._prev_use_ind[ind] >= len(self._prev_use_ind):
-			return None
-
-		return self._prev_use_ind[ind]
+		prev_use_ind = self._prev_use_ind[ind]
+		return None if prev_use_ind >= self._len else prev_use_ind
 
 	def prev_use_ind_inf(self, ind: int) -> Union[int, float]:
-		if self._prev_use_ind[ind] >= len(self._prev_use_ind):
-			return math.inf
-
-		return self._prev_use_ind[ind]
+		prev_use_ind = self._prev_use_ind[ind]
+		return _inf if prev_use_ind >= self._len else prev_use_ind
 
 	def prev_use_ind_len(self, ind: int) -> int:
 		return self._prev_use_ind[ind]
 
 	def next_use_ind(self, ind: int) -> Optional[int]:
-		if self._next_use_ind[ind] >= len(self._next_use_ind):
-			return None
-
-		return self._next_use_ind[ind]
+		next_use_ind = self._next_use_ind[ind]
+		return None if next_use_ind >= self._len else next_use_ind
 
 	def next_use_ind_inf(self, ind: int) -> Union[int, float]:
-		if self._next_use_ind[ind] >= len(self._next_use_ind):
-			return math.inf
-
-		return self._next_use_ind[ind]
+		next_use_ind = self._next_use_ind[ind]
+		return _inf if next_use_ind >= self._len else next_use_ind
 
 	def next_use_ind_len(self, ind: int) -> int:
 		return self._next_use_ind[ind]
@@ -152,12 +133,22 @@ class FullReuseIndex(object):
 	def access_ts(self, ind: int) -> int:
 		return self._access_ts[ind]
 
+	def file_id(self, ind: int) -> int:
+		return self._file_id[ind]
+
 	def parts(self, ind: int) -> List[PartSpec]:
-		r = self._parts_range(ind)
-		return list(zip(
-			(self._parts[i] for i in r),
-			(self._part_sizes[i] for i in r),
-		))
+		start, end = self._parts_bounds(ind)
+		return list(zip(self._parts[start:end], self._part_sizes[start:end]))
+
+	def _parts_bounds(self, ind: int) -> Tuple[int, int]:
+		"""Returns the bounds [start, end) of the parts of the access at ``ind``.
+
+		The bounds index into _parts and _part_sizes.
+		"""
+		if ind + 1 < self._len:
+			return self._parts_offset[ind], self._parts_offset[ind + 1]
+		else:
+			return self._parts_offset[ind], len(self._parts)
 
 	def accessed_after(self, after_ind: int, parts: Sequence[PartSpec]) -> List[PartSpec]:
 		return list(self._accessed_following(after_ind, self._next_use_ind, parts))
@@ -168,7 +159,7 @@ class FullReuseIndex(object):
 	def _accessed_following(
 		self,
 		start_ind: int,
-		following_use_ind: 'array[int]',
+		following_use_ind: 'memoryview[int]',
 		parts: Sequence[PartSpec],
 	) -> Iterator[PartSpec]:
 		# Tracks how many bytes of what part have not been found yet.
@@ -180,19 +171,18 @@ class FullReuseIndex(object):
 		missing = {ind: (size, 0) for ind, size in parts}
 
 		# Store variables in the local namespace
-		parts_range = self._parts_range
+		parts_bounds = self._parts_bounds
 		parts_array = self._parts
 		part_sizes_array = self._part_sizes
 
 		accesses_length = len(following_use_ind)
 		next_ind = following_use_ind[start_ind]
 		while len(missing) > 0 and next_ind < accesses_length:
-			for i in parts_range(next_ind):
-				part_ind = parts_array[i]
+			start, end = parts_bounds(next_ind)
+			for part_ind, part_size in zip(parts_array[start:end], part_sizes_array[start:end]):
 				if part_ind not in missing:
 					continue
 
-				part_size = part_sizes_array[i]
 				size_requested, max_size_found = missing[part_ind]
 				if part_size >= size_requested:
 					del missing[part_ind]
@@ -215,7 +205,7 @@ class FullReuseIndex(object):
 	def _reuses_following(
 		self,
 		start_ind: int,
-		following_use_ind: 'array[int]',
+		following_use_ind: 'memoryview[int]',
 		parts: Sequence[PartSpec],
 	) -> Iterator[Tuple[int, PartInd, BytesSize, BytesSize]]:
 		# Tracks how many bytes of what part have not been found yet.
@@ -227,19 +217,18 @@ class FullReuseIndex(object):
 		missing = {ind: (size, 0) for ind, size in parts}
 
 		# Store variables in the local namespace
-		parts_range = self._parts_range
+		parts_bounds = self._parts_bounds
 		parts_array = self._parts
 		part_sizes_array = self._part_sizes
 
 		accesses_length = len(following_use_ind)
 		next_ind = following_use_ind[start_ind]
 		while len(missing) > 0 and next_ind < accesses_length:
-			for i in parts_range(next_ind):
-				part_ind = parts_array[i]
+			start, end = parts_bounds(next_ind)
+			for part_ind, part_size in zip(parts_array[start:end], part_sizes_array[start:end]):
 				if part_ind not in missing:
 					continue
 
-				part_size = part_sizes_array[i]
 				size_requested, max_size_found = missing[part_ind]
 				if part_size >= size_requested:
 					del missing[part_ind]
@@ -253,79 +242,133 @@ class FullReuseIndex(object):
 			next_ind = following_use_ind[next_ind]
 
 	def _verify(self, accesses: Sequence[Access]) -> None:
+		"""Checks the index against accesses, runs in O(len(accesses)).
+
+		The use indices are checked by a forward sweep (prev_use_ind) and a
+		backward sweep (next_use_ind), each tracking the last seen index for
+		every file.
+		"""
 		accesses_length = len(self._prev_use_ind)
+		assert len(accesses) == accesses_length, 'mismatching length'
 
-		for ind in range(accesses_length):
-			file = accesses[ind].file
+		last_seen: Dict[FileID, int] = {}
+		file_ids: Dict[FileID, int] = {}
 
-			next_use_ind = self._next_use_ind[ind]
-			for i in range(ind + 1, next_use_ind):
-				assert accesses[i].file != file, 'found earlier reuse ind'
-			if next_use_ind != accesses_length:
-				assert accesses[next_use_ind].file == file, 'invalid reuse ind'
+		for ind in range(accesses_length):
+			access = accesses[ind]
+			file = access.file
 
-			prev_use_ind = self._prev_use_ind[ind]
-			for i in range(prev_use_ind + 1 if prev_use_ind != accesses_length else 0, ind):
-				assert accesses[i].file != file, 'found later reuse ind'
-			if prev_use_ind != accesses_length:
-				assert accesses[prev_use_ind].file == file, 'invalid reuse ind'
+			assert self._prev_use_ind[ind] == last_seen.get(file, accesses_length), \
+				'invalid prev use ind'
+			last_seen[file] = ind
 
+			assert access.access_ts == self._access_ts[ind], 'mismatching access_ts'
 
-			assert accesses[ind].access_ts == self._access_ts[ind], 'mismatching access_ts'
+			assert file_ids.setdefault(file, len(file_ids)) == self._file_id[ind], \
+				'mismatching file_id'
 
-			sorted_parts = sorted(accesses[ind].parts)
-			r = self._parts_range(ind)
-			assert [ind for ind, _ in sorted_parts] == [self._parts[i] for i in r], \
+			sorted_parts = sorted(access.parts)
+			start, end = self._parts_bounds(ind)
+			assert [ind for ind, _ in sorted_parts] == self._parts[start:end].tolist(), \
 				'mismatching part indices'
-			assert [size for _, size in sorted_parts] == [self._part_sizes[i] for i in r], \
+			assert [size for _, size in sorted_parts] == self._part_sizes[start:end].tolist(), \
 				'mismatching part sizes'
 
-	@staticmethod
+		last_seen.clear()
+
+		for ind in reversed(range(accesses_length)):
+			file = accesses[ind].file
+
+			assert self._next_use_ind[ind] == last_seen.get(file, accesses_length), \
+				'invalid next use ind'
+			last_seen[file] = ind
+
+	@classmethod
+	def _meta_columns(
+		cls,
+		meta: 'array[int]',
+	) -> Tuple['memoryview[int]', 'memoryview[int]', 'memoryview[int]', 'memoryview[int]', 'memoryview[int]']:
+		"""Splits meta into its column views.
+
+		Returns (prev_use_ind, next_use_ind, access_ts, file_id, parts_offset).
+		"""
+		accesses_length = len(meta) // cls._meta_rows
+		view = memoryview(meta)
+
+		return (
+			view[0 * accesses_length:1 * accesses_length],
+			view[1 * accesses_length:2 * accesses_length],
+			view[2 * accesses_length:3 * accesses_length],
+			view[3 * accesses_length:4 * accesses_length],
+			view[4 * accesses_length:5 * accesses_length],
+		)
+
+	@classmethod
 	def _build(
+		cls,
 		accesses: SimpleAccessReader,
-	) -> Tuple['array[int]', 'array[int]', 'array[int]', 'array[int]', 'array[int]', 'array[int]']:
-		# Possible optimisation: Could build prev_use_ind from next_use_ind by
-		# "reversing the pointer direction".
+	) -> Tuple['array[int]', 'array[int]', 'array[int]']:
+		# next_use_ind is built from prev_use_ind by "reversing the pointer
+		# direction" during the same pass over accesses.
 		# Possible optimisation: Iterate fully before calling len() saves one
 		# full iteration. The length is not necessary to know in advance.
 		# Possible optimisation: Could specify the exact size of parts and
-		# part_sizes by counting during the next_use_ind building. However,
+		# part_sizes by counting during the prev_use_ind building. However,
 		# this makes asymptotically no difference and is incompatible with the
-		# two optimisations described before.
+		# optimisation described before.
 
 		prev_access: Dict[FileID, int] = {}
+		file_ids: Dict[FileID, int] = {}
 		accesses_length = len(accesses)
 
-		prev_use_ind: 'array[int]' = array('Q', itertools.repeat(0, accesses_length))
-		access_ts: 'array[int]' = array('Q', itertools.repeat(0, accesses_length))
-		parts_offset: 'array[int]' = array('Q', itertools.repeat(0, accesses_length))
+		meta: 'array[int]' = array('Q', (0,)) * (cls._meta_rows * accesses_length)
+		prev_use_ind, next_use_ind, access_ts, file_id, parts_offset = cls._meta_columns(meta)
 		parts: 'array[int]' = array('Q')
 		part_sizes: 'array[int]' = array('Q')
+		parts_append = parts.append
+		part_sizes_append = part_sizes.append
+
+		next_use_ind[:] = array('Q', (accesses_length,)) * accesses_length
 
 		running_offset = 0
 		for ind, access in enumerate(accesses):
-			prev_use_ind[ind] = prev_access.get(access.file, accesses_length)
+			prev_ind = prev_access.get(access.file, accesses_length)
+			prev_use_ind[ind] = prev_ind
+			if prev_ind != accesses_length:
+				next_use_ind[prev_ind] = ind
 			prev_access[access.file] = ind
 
+			file_id[ind] = file_ids.setdefault(access.file, len(file_ids))
+
 			access_ts[ind] = access.access_ts
 
-			sorted_parts = sorted(access.parts)
-			parts.extend(part_ind for part_ind, _ in sorted_parts)
-			part_sizes.extend(part_size for _, part_size in sorted_parts)
+			sorted_parts = _sorted_parts(access.parts)
+			for part_ind, part_size in sorted_parts:
+				parts_append(part_ind)
+				part_sizes_append(part_size)
 			parts_offset[ind] = running_offset
 			running_offset += len(sorted_parts)
 
 		del prev_access
+		del file_ids
+
+		return meta, parts, part_sizes
 
-		return (
-			prev_use_ind,
-			ReuseTimer._build_reuse_ind(accesses),
-			access_ts,
-			parts_offset,
-			parts,
-			part_sizes,
-		)
 
+def _sorted_parts(parts: Sequence[PartSpec]) -> Sequence[PartSpec]:
+	"""Returns parts sorted by part index (and size).
+
+	Accesses mostly consist of one or two parts. These cases are handled
+	without calling sorted(), which has a comparatively large constant
+	overhead for such short sequences.
+	"""
+	if len(parts) == 1:
+		return parts
+	elif len(parts) == 2:
+		first, second = parts
+		return parts if first <= second else (second, first)
+	else:
+		return sorted(parts)
 
 def change_to_active_files(full_reuse_index: FullReuseIndex, ind: int) -> int:
 	accesses_length = len(full_reuse_index)
@@ -340,6 +383,17 @@ def change_to_active_files(full_reuse_index: FullReuseIndex, ind: int) -> int:
 	else:
 		return 0
 
+def active_files_changes(full_reuse_index: FullReuseIndex) -> 'array[int]':
+	"""change_to_active_files for all indices of full_reuse_index at once.
+	"""
+	accesses_length = len(full_reuse_index)
+	# accessed after (1 or 0) - accessed before (1 or 0)
+	return array('b', map(
+		operator.sub,
+		map(accesses_length.__gt__, full_reuse_index._next_use_ind),
+		map(accesses_length.__gt__, full_reuse_index._prev_use_ind),
+	))
+
 def change_to_active_bytes(full_reuse_index: FullReuseIndex, ind: int) -> BytesSize:
 	parts = full_reuse_index.parts(ind)
 
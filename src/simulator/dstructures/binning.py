@@ -1,6 +1,22 @@
 import abc
+from array import array
+from functools import lru_cache
 import itertools
-from typing import Callable, cast, Generic, Iterable, Iterator, List, Mapping, Set, Tuple, TypeVar
+from typing import (
+	Any,
+	Callable,
+	cast,
+	Dict,
+	Generic,
+	Iterable,
+	Iterator,
+	Mapping,
+	MutableSequence,
+	Optional,
+	Set,
+	Tuple,
+	TypeVar,
+)
 
 from .sorted import SortedDefaultDict
 
@@ -30,15 +46,45 @@ class Binner(abc.ABC):
 	def __call__(self, num: int) -> int:
 		raise NotImplementedError
 
+	@property
+	def fingerprint(self) -> Optional[Tuple[Any, ...]]:
+		"""Hashable description of the binning scheme, None if unknown.
+
+		Binners with equal fingerprints assign every number to the same bin.
+		"""
+		return None
+
+	@property
+	def uniform(self) -> bool:
+		"""Whether all bins have the same width.
+
+		Uniform binners provide the width property, the bin of num is
+		num // width.
+		"""
+		return False
+
 
 class LinearBinner(Binner):
 	def __init__(self, width: int=1) -> None:
 		self._width: int = width
+		self._fingerprint: Tuple[Any, ...] = (LinearBinner, width)
 
 	@property
 	def bounded(self) -> bool:
 		return False
 
+	@property
+	def uniform(self) -> bool:
+		return True
+
+	@property
+	def width(self) -> int:
+		return self._width
+
+	@property
+	def fingerprint(self) -> Tuple[Any, ...]:
+		return self._fingerprint
+
 	@property
 	def bins(self) -> int:
 		return -1
@@ -61,32 +107,59 @@ class LogBinner(Binner):
 		self._step: int = step
 
 		self._bins = -1 if last == -1 else (last - first) // step + 1
+		# last is normalised to the first exponent of the last bin, binners
+		# only differing in last within the last bin behave the same.
+		self._fingerprint: Tuple[Any, ...] = (
+			LogBinner, first, -1 if last == -1 else first + (self._bins - 1) * step, step,
+		)
+
+		# The exponent is clipped to [first, last] through conditional
+		# expressions, which are considerably cheaper than calling min() and
+		# max().
+		# The edges of bounded binners are materialised once, bin_edges() is
+		# called for every iteration over a BinnedMapping.
+		self._edges: Optional[Tuple[int, ...]] = None
+		if last != -1:
+			self._edges = _log_edges(first, last, step)
 
 		self._bin: Callable[[int], int]
 		if last == -1:
-			self._bin = lambda num: (max(num.bit_length() - 1, first) - first) // step
+			def unbounded_bin(num: int) -> int:
+				exp = num.bit_length() - 1 - first
+				return 0 if exp <= 0 else exp // step
+
+			self._bin = unbounded_bin
 		else:
-			self._bin = lambda num: (min(max(num.bit_length() - 1, first), last) - first) // step
+			span = last - first
+			last_bin = span // step
+
+			def bounded_bin(num: int) -> int:
+				exp = num.bit_length() - 1 - first
+				return 0 if exp <= 0 else (last_bin if exp >= span else exp // step)
+
+			self._bin = bounded_bin
 
 	@property
 	def bounded(self) -> bool:
 		return self._last != -1
 
+	@property
+	def fingerprint(self) -> Tuple[Any, ...]:
+		return self._fingerprint
+
 	@property
 	def bins(self) -> int:
 		return self._bins
 
 	def bin_edges(self) -> Iterator[int]:
-		it: Iterable[int]
-		if self._bins == -1:
-			it = itertools.count(start=self._first+self._step, step=self._step)
-		else:
-			it = range(self._first+self._step, self._last+1, self._step)
+		if self._edges is not None:
+			return iter(self._edges)
 
-		return itertools.chain((0,), (2 ** i for i in it))
+		it = itertools.count(start=self._first+self._step, step=self._step)
+		return itertools.chain((0,), (1 << i for i in it))
 
 	def bin_limits(self, bin: int) -> Tuple[int, int]:
-		real_first = (2 ** (self._first + bin * self._step))
+		real_first = 1 << (self._first + bin * self._step)
 		first: int
 		last: int
 
@@ -98,7 +171,7 @@ class LogBinner(Binner):
 		if self._last != -1 and bin == self._bins - 1:
 			past = -1
 		else:
-			past = real_first * 2 ** self._step
+			past = real_first << self._step
 
 		return first, past
 
@@ -106,10 +179,33 @@ class LogBinner(Binner):
 		return self._bin(num)
 
 
+@lru_cache(maxsize=64)
+def _log_edges(first: int, last: int, step: int) -> Tuple[int, ...]:
+	"""Returns the bin edges of a bounded LogBinner, shared between binners.
+	"""
+	return (0,) + tuple(1 << i for i in range(first + step, last + 1, step))
+
+
 _T_co = TypeVar('_T_co', covariant=True)
 _T_co_inner = TypeVar('_T_co_inner', covariant=True)
 
 class BinnedMapping(Generic[_T_co], Mapping[int, _T_co]):
+	"""Mapping of bins (as determined by a binner) to values.
+
+	Values are created through default_factory. If default_factory is one of
+	the scalar types int or float, the values are stored unboxed in an array
+	and can be accumulated through add() and add_many(). Should an int value
+	exceed the range of the array (64-bit signed), the values are moved to a
+	list.
+	"""
+
+	# Maps scalar default factories to the type code of the array used as
+	# the container.
+	_scalar_type_codes: Dict[Any, str] = {
+		int: 'q',
+		float: 'd',
+	}
+
 	class _ItemSet(Generic[_T_co_inner], Set[Tuple[int, _T_co_inner]]):
 		def __init__(self, mapping: 'BinnedMapping[_T_co_inner]') -> None:
 			self._mapping: BinnedMapping[_T_co_inner] = mapping
@@ -148,17 +244,37 @@ class BinnedMapping(Generic[_T_co], Mapping[int, _T_co]):
 		self._default_factory: Callable[[], _T_co] = default_factory
 
 		self._binner: Binner = binner
-		self._container: List[_T_co]
+		self._container: MutableSequence[_T_co]
 		self._get_element: Callable[[int], _T_co]
 
+		type_code = self._scalar_type_codes.get(default_factory)
+
 		if self._binner.bins != -1:
-			container = list(default_factory() for _ in range(self._binner.bins))
+			container: MutableSequence[_T_co]
+			if type_code is not None:
+				container = cast(
+					'MutableSequence[_T_co]',
+					array(type_code, itertools.repeat(default_factory(), self._binner.bins)),
+				)
+			else:
+				container = list(default_factory() for _ in range(self._binner.bins))
 			self._container = container
-			self._get_element = lambda bin: container[bin]
+			self._get_element = container.__getitem__
 		else:
-			self._container = []
+			if type_code is not None:
+				self._container = cast('MutableSequence[_T_co]', array(type_code))
+			else:
+				self._container = []
 			self._get_element = self._construct_or_get_element
 
+	def _unbox(self) -> None:
+		"""Replaces the array container by a list of the same values.
+		"""
+		container = list(self._container)
+		self._container = container
+		if self._binner.bins != -1:
+			self._get_element = container.__getitem__
+
 	def _construct_or_get_element(self, bin: int) -> _T_co:
 		try:
 			return self._container[bin]
@@ -192,6 +308,49 @@ class BinnedMapping(Generic[_T_co], Mapping[int, _T_co]):
 		else:
 			raise TypeError('The BinnedMapping is unbounded, len(.) is undefined')
 
+	def add(self, num: int, x: Any) -> None:
+		"""Adds x to the value of the bin num falls into.
+
+		Equivalent to ``mapping[num] += x`` for immutable values.
+		"""
+		bin = self._binner(num)
+		if self._binner.bins == -1:
+			_ = self._construct_or_get_element(bin)
+
+		container = cast('MutableSequence[Any]', self._container)
+		try:
+			container[bin] += x
+		except OverflowError:
+			self._unbox()
+			cast('MutableSequence[Any]', self._container)[bin] += x
+
+	def add_many(self, nums: Iterable[int], xs: Iterable[Any]) -> None:
+		"""Adds each element of xs to the value of the bin of the respective num.
+		"""
+		binner = self._binner
+		container = cast('MutableSequence[Any]', self._container)
+
+		if binner.bins == -1:
+			construct_or_get_element = self._construct_or_get_element
+			for num, x in zip(nums, xs):
+				bin = binner(num)
+				_ = construct_or_get_element(bin)
+				try:
+					container[bin] += x
+				except OverflowError:
+					self._unbox()
+					container = cast('MutableSequence[Any]', self._container)
+					container[bin] += x
+		else:
+			for num, x in zip(nums, xs):
+				bin = binner(num)
+				try:
+					container[bin] += x
+				except OverflowError:
+					self._unbox()
+					container = cast('MutableSequence[Any]', self._container)
+					container[bin] += x
+
 	def items(self) -> 'BinnedMapping._ItemSet[_T_co]':
 		return BinnedMapping._ItemSet(self)
 
@@ -1,26 +1,34 @@
 from array import array
+from bisect import bisect_right
+from collections import Counter
 import itertools
 import math
 from typing import (
 	AbstractSet,
+	Any,
 	Callable,
 	cast,
+	Dict,
 	Generic,
 	Iterable,
 	Iterator,
+	List,
 	Mapping,
 	Optional,
+	Sequence,
 	Tuple,
+	Type,
 	TypeVar,
 	Union,
 	ValuesView,
 )
 
-from .binning import Binner
+from .binning import Binner, LinearBinner
 
 
 _T = TypeVar('_T', int, float)
 _T_inner = TypeVar('_T_inner', int, float)
+_S = TypeVar('_S', bound='_BinnedArray[Any]')
 
 class _BinnedArray(Generic[_T], Mapping[int, _T]):
 	_type_code: str = 'Q'
@@ -36,9 +44,9 @@ class _BinnedArray(Generic[_T], Mapping[int, _T]):
 			return len(self._b_array)
 
 		def __contains__(self, el: object) -> bool:
-			for count in self._b_array._bins:
-				if count == el:
-					return True
+			# The array is scanned in C
+			if el in self._b_array._bins:
+				return True
 			if not self._b_array.bounded and el == self._b_array._zero_value:
 				return True
 			return False
@@ -68,14 +76,15 @@ class _BinnedArray(Generic[_T], Mapping[int, _T]):
 				return False
 
 		def __iter__(self) -> Iterator[Tuple[int, _T_inner]]:
-			if self._b_array._binner.bins == -1:
+			edges = self._b_array._edges
+			if edges is None:
 				zero_value = self._b_array._zero_value
 				return zip(
 					self._b_array._binner.bin_edges(),
 					itertools.chain(self._b_array._bins, itertools.repeat(zero_value)),
 				)
 			else:
-				return zip(self._b_array._binner.bin_edges(), self._b_array._bins)
+				return zip(edges, self._b_array._bins)
 
 
 	def __init__(self, binner: Binner) -> None:
@@ -83,66 +92,61 @@ class _BinnedArray(Generic[_T], Mapping[int, _T]):
 		self._bins: array[_T]
 		self._total: _T
 
-		self._get_bin: Callable[[int], _T]
-		self._set_bin: Callable[[int, _T], None]
-		self._increment: Callable[[int, _T], None]
+		# The edges of bounded binners are materialised once, instead of
+		# iterating through binner.bin_edges() for each __iter__ or items().
+		edges: Optional[List[int]] = list(binner.bin_edges()) if binner.bins != -1 else None
+		self._edges: Optional[List[int]] = edges
 
-		if self._binner.bins != -1:
-			self._get_bin = lambda bin: self._bins[bin]
-			self._set_bin = self._set_bin_bounded
-			self._increment = self._increment_bounded
-		else:
-			self._get_bin = self._get_bin_unbounded
-			self._set_bin = self._set_bin_unbounded
-			self._increment = self._increment_unbounded
+		self._bin_of: Callable[[int], int]
+		self._init_bin_of()
 
 		self._init_bins_and_total()
 
-	def _init_bins_and_total(self) -> None:
-		zero_value = self._zero_value
-
-		it: Iterable[_T]
-		if self._binner.bins == -1:
-			it = []
+	def _init_bin_of(self) -> None:
+		# Uniform binners compute the bin through a single floor division,
+		# which is inlined here instead of calling the binner. For other
+		# bounded binners the bin is looked up by bisecting the bin edges.
+		binner, edges = self._binner, self._edges
+		if binner.uniform:
+			width = cast(LinearBinner, binner).width
+			self._bin_of = lambda num: num // width
+		elif edges is not None:
+			# The lower edge of the first bin is skipped, so that the index
+			# found is the bin directly.
+			upper_edges = edges[1:]
+			self._bin_of = lambda num: bisect_right(upper_edges, num)
 		else:
-			it = (zero_value for _ in range(self._binner.bins))
-
-		self._bins = array(self._type_code, it)
-		self._total = zero_value
-
-	def _get_bin_unbounded(self, bin: int) -> _T:
-		try:
-			return self._bins[bin]
-		except IndexError:
-			return self._zero_value
-
-	def _increment_unbounded(self, bin: int, incr: _T) -> None:
-		try:
-			self._bins[bin] += incr
-			self._total += incr
-		except IndexError:
-			self._extend_and_set(bin, incr)
-
-	def _set_bin_unbounded(self, bin: int, val: _T) -> None:
-		try:
-			old_val = self._bins[bin]
-			self._bins[bin] = val
-			self._total += val - old_val
-		except IndexError:
-			self._extend_and_set(bin, val)
-
-	def _increment_bounded(self, bin: int, incr: _T) -> None:
-		self._bins[bin] += incr
-		self._total += incr
+			self._bin_of = binner.__call__
+
+	def __getstate__(self) -> Dict[str, Any]:
+		# _bin_of may be a lambda, which can not be pickled. It is rebuilt
+		# from the binner in __setstate__.
+		state = self.__dict__.copy()
+		del state['_bin_of']
+		return state
+
+	def __setstate__(self, state: Dict[str, Any]) -> None:
+		self.__dict__.update(state)
+		self._init_bin_of()
+
+	def __new__(cls: Type[_S], binner: Optional[Binner] = None, *args: Any, **kwargs: Any) -> _S:
+		# Bounded binners have all bins allocated up front, the bounded
+		# variant of the class skips the handling of missing bins. binner is
+		# not passed when copying, cls is already the right variant then.
+		if binner is not None and binner.bins != -1:
+			cls = _bounded_classes.get(cls, cls)
+		return super(_BinnedArray, cls).__new__(cls)
 
-	def _set_bin_bounded(self, bin: int, val: _T) -> None:
-		old_val = self._bins[bin]
-		self._bins[bin] = val
-		self._total += val - old_val
+	def _init_bins_and_total(self) -> None:
+		self._bins = array(self._type_code)
+		if self._binner.bins != -1:
+			# All-zero bytes represent the zero value of all integer and
+			# floating point type codes.
+			self._bins.frombytes(bytes(self._binner.bins * self._bins.itemsize))
+		self._total = self._zero_value
 
 	def _extend_and_set(self, bin: int, val: _T) -> None:
-		it = itertools.repeat(self._zero_value, bin - len(self._bins) + 1)
-		self._bins.extend(it)
+		self._bins.frombytes(bytes((bin - len(self._bins) + 1) * self._bins.itemsize))
 		self._bins[bin] = val
 		self._total += val
 
@@ -163,8 +167,16 @@ class _BinnedArray(Generic[_T], Mapping[int, _T]):
 		return self._bins
 
 	def __iter__(self) -> Iterator[int]:
+		if self._edges is not None:
+			return iter(self._edges)
 		return self._binner.bin_edges()
 
+	def __repr__(self) -> str:
+		# The bounded variants are an implementation detail, the public class
+		# is shown instead.
+		cls = _public_classes.get(type(self), type(self))
+		return f'<{cls.__module__}.{cls.__qualname__} object at {id(self):#x}>'
+
 	def __len__(self) -> int:
 		if self._binner.bounded:
 			return self._binner.bins
@@ -174,19 +186,53 @@ class _BinnedArray(Generic[_T], Mapping[int, _T]):
 			)
 
 	def __getitem__(self, num: int) -> _T:
-		return self._get_bin(self._binner(num))
+		try:
+			return self._bins[self._bin_of(num)]
+		except IndexError:
+			return self._zero_value
 
 	def __setitem__(self, num: int, val: _T) -> None:
-		self._set_bin(self._binner(num), val)
+		bin = self._bin_of(num)
+		try:
+			old_val = self._bins[bin]
+			self._bins[bin] = val
+			self._total += val - old_val
+		except IndexError:
+			self._extend_and_set(bin, val)
 
 	def __contains__(self, el: object) -> bool:
 		return isinstance(0, int)
 
 	def increment(self, num: int, incr: _T=1) -> None:
-		self._increment(self._binner(num), incr)
+		bin = self._bin_of(num)
+		try:
+			self._bins[bin] += incr
+			self._total += incr
+		except IndexError:
+			self._extend_and_set(bin, incr)
 
 	def decrement(self, num: int, decr: _T=1) -> None:
-		self._increment(self._binner(num), -decr)
+		self.increment(num, -decr)
+
+	def increment_many(self, nums: Iterable[int], incr: _T=1) -> None:
+		"""Increments the bin of each of nums by incr.
+
+		Equivalent to calling increment() for each element of nums. The
+		occurrences of each bin are counted first (in C, by Counter), so that
+		each bin is only updated once.
+		"""
+		counts = Counter(map(self._bin_of, nums))
+		if not counts:
+			return
+
+		bins = self._bins
+		max_bin = max(counts)
+		if max_bin >= len(bins):
+			bins.frombytes(bytes((max_bin - len(bins) + 1) * bins.itemsize))
+
+		for bin, count in counts.items():
+			bins[bin] += incr * count
+		self._total += incr * sum(counts.values())
 
 	def reset(self) -> None:
 		self._init_bins_and_total()
@@ -198,6 +244,31 @@ class _BinnedArray(Generic[_T], Mapping[int, _T]):
 		return _BinnedArray._ValuesView(self)
 
 
+class _BoundedBinnedArray(_BinnedArray[_T]):
+	"""Variant of _BinnedArray used for bounded binners.
+
+	All bins exist from the start, so bins are accessed without checking for
+	IndexError.
+	"""
+
+	def __getitem__(self, num: int) -> _T:
+		return self._bins[self._bin_of(num)]
+
+	def __setitem__(self, num: int, val: _T) -> None:
+		bin = self._bin_of(num)
+		old_val = self._bins[bin]
+		self._bins[bin] = val
+		self._total += val - old_val
+
+	def increment(self, num: int, incr: _T=1) -> None:
+		self._bins[self._bin_of(num)] += incr
+		self._total += incr
+
+	def decrement(self, num: int, decr: _T=1) -> None:
+		self._bins[self._bin_of(num)] -= decr
+		self._total -= decr
+
+
 class _ImmutableMixIn(Generic[_T]):
 	_mutating_exception_msg = 'Mutating methods are not supported on {}'
 
@@ -210,6 +281,9 @@ class _ImmutableMixIn(Generic[_T]):
 	def decrement(self, num: int, decr: _T=1) -> None:
 		raise TypeError(self._mutating_exception_msg.format(self.__class__.__name__))
 
+	def increment_many(self, nums: Iterable[int], incr: _T=1) -> None:
+		raise TypeError(self._mutating_exception_msg.format(self.__class__.__name__))
+
 	def reset(self) -> None:
 		raise TypeError(self._mutating_exception_msg.format(self.__class__.__name__))
 
@@ -234,17 +308,58 @@ class _ModifyMixIn(Generic[_T]):
 			# bin (what about first and last bin of infinite size)?
 			raise ValueError('counters binning scheme is not matching this binning scheme')
 
-		trsf_func: Callable[[float], _T]
+		self._total = _ewma_update_array(
+			self._bins,
+			counters.bin_data,
+			ewma_factor,
+			self._transform_func(),
+		)
+
+	def update_batch(self, counters_list: Sequence[_BinnedArray[_T]], ewma_factor: float) -> None:
+		"""Update bin counter values by combining with each of counters_list.
+
+		Equivalent to calling update() for each element of counters_list in
+		order. Instead of n sequential passes, the EWMA recurrence is unrolled
+		into a weighted sum: With a = ewma_factor and d = 1 - a, the k-th (of
+		n) counters is weighted by a * d ** (n-1-k) and the current value by
+		d ** n.
+
+		The conversion to the value type is only applied to the final result.
+		For integer counters, the result may therefore be slightly larger than
+		the result of sequential update() calls, which truncate after each
+		step.
+
+		"""
+
+		for counters in counters_list:
+			if not _binners_similar(counters.binner, self.binner):
+				raise ValueError('counters binning scheme is not matching this binning scheme')
+
+		if len(counters_list) == 0:
+			return
+
+		acc = _ewma_combine(self._bins, [counters.bin_data for counters in counters_list], ewma_factor)
+
+		self._bins[:] = array(self._bins.typecode, map(self._transform_func(), acc))
+		self._total = sum(self._bins, self._transform_func()(0.0))
+
+	def _transform_func(self) -> Callable[[float], _T]:
 		if self._type_code in ('f', 'd'):
-			trsf_func = cast('Callable[[float], _T]', float)
+			return cast('Callable[[float], _T]', float)
 		else:
-			trsf_func = cast('Callable[[float], _T]', int)
+			return cast('Callable[[float], _T]', int)
 
-		self._total = _ewma_update_array(self._bins, counters.bin_data, ewma_factor, trsf_func)
+	def set_bin_data(self, data: 'array[_T]', total: Optional[_T]=None) -> None:
+		"""Replaces the bins with data.
 
-	def set_bin_data(self, data: 'array[_T]') -> None:
+		If the sum of data is already known to the caller, it may be passed as
+		total, saving a pass over data. data is converted if its type code
+		differs from the one of this instance.
+		"""
+		if data.typecode != self._type_code:
+			data = array(self._type_code, data)
 		self._bins = data
-		self._total = sum(self._bins)
+		self._total = sum(data) if total is None else total
 
 
 def _ewma_update_array(
@@ -253,39 +368,125 @@ def _ewma_update_array(
 	ewma_factor: float,
 	transform_func: Callable[[float], _T],
 ) -> _T:
-	decay_factor = 1.0 - ewma_factor
-
 	zero = transform_func(0.0)
-	total = zero
 
 	if len(orig) < len(inp):
-		orig.extend(
-			itertools.repeat(zero, len(inp) - len(orig) + 1),
-		)
+		# Padding by repeating a one-element array is done in C.
+		orig.extend(array(orig.typecode, (zero,)) * (len(inp) - len(orig) + 1))
+
+	# Update each orig element by combining with the value from the
+	# corresponding element of inp using EWMA. Elements of orig past the end
+	# of inp are combined with 0. Each part is computed in a single
+	# comprehension and written back through slice assignment.
+	if transform_func is float:
+		# The EWMA terms are floats already, skip the no-op float() calls.
+		_ewma_update_float_array(cast(Any, orig), cast(Any, inp), ewma_factor)
+		return sum(orig, zero)
+	else:
+		return cast(_T, sum(_ewma_update_int_array(cast(Any, orig), cast(Any, inp), ewma_factor)))
 
-	for i in range(len(inp)):
-		# Update each orig element by combining with the value
-		# from the corresponding element of inp using EWMA
-		val = transform_func(
-			ewma_factor * inp[i] + decay_factor * orig[i],
-		)
-		orig[i] = val
-		total += val
+def _ewma_combine(
+	orig: Sequence[float],
+	inps: Sequence[Sequence[float]],
+	ewma_factor: float,
+) -> List[float]:
+	"""Returns orig combined with each of inps in order using EWMA.
+
+	With a = ewma_factor and d = 1 - a, the k-th (of n) inputs is weighted by
+	a * d ** (n-1-k) and orig by d ** n. The result is as long as the longest
+	of orig and inps, missing elements are treated as 0.
+	"""
+	n = len(inps)
+	decay_factor = 1.0 - ewma_factor
+	length = max(itertools.chain((len(orig),), map(len, inps)))
+
+	state_weight = decay_factor ** n
+	acc = [state_weight * val for val in orig]
+	acc.extend(itertools.repeat(0.0, length - len(acc)))
+
+	for k, inp in enumerate(inps):
+		weight = ewma_factor * decay_factor ** (n - 1 - k)
+		acc[:len(inp)] = [
+			acc_val + weight * inp_val for acc_val, inp_val in zip(acc, inp)
+		]
 
-	for i in range(len(inp), len(orig)):
-		val = transform_func(decay_factor * orig[i])
-		orig[i] = val
-		total += val
+	return acc
 
-	return total
+def _ewma_update_int_array(
+	orig: 'array[int]',
+	inp: 'array[int]',
+	ewma_factor: float,
+) -> List[int]:
+	"""Updates orig in-place and returns the updated values as a list.
+
+	Callers can continue working with the list (e.g. compute the total and
+	normalise) instead of reading the values back from orig.
+	"""
+	decay_factor = 1.0 - ewma_factor
+	inp_length = len(inp)
+
+	values = [
+		int(ewma_factor * inp_val + decay_factor * orig_val)
+		for inp_val, orig_val in zip(inp, orig)
+	]
+	values.extend([int(decay_factor * orig_val) for orig_val in orig[inp_length:]])
+	orig[:] = array(orig.typecode, values)
+
+	return values
+
+def _ewma_update_float_array(
+	orig: 'array[float]',
+	inp: 'array[float]',
+	ewma_factor: float,
+) -> None:
+	decay_factor = 1.0 - ewma_factor
+	inp_length = len(inp)
+
+	orig[:inp_length] = array(orig.typecode, [
+		ewma_factor * inp_val + decay_factor * orig_val
+		for inp_val, orig_val in zip(inp, orig)
+	])
+	orig[inp_length:] = array(orig.typecode, [
+		decay_factor * orig_val for orig_val in orig[inp_length:]
+	])
+
+def _scale_int_array(arr: 'array[int]', type_code: str, factor: float) -> int:
+	"""Multiplies all elements of arr by factor (rounding down), returns the sum.
+
+	arr must not contain negative values. If factor is 2 ** -k, the elements
+	are shifted right by k bits instead.
+	"""
+	mantissa, exponent = math.frexp(factor)
+	if mantissa == 0.5 and exponent <= 1:
+		shift = 1 - exponent
+		arr[:] = array(type_code, [val >> shift for val in arr])
+	else:
+		arr[:] = array(type_code, [int(val * factor) for val in arr])
+	return sum(arr)
+
+def _unsigned_type_code(max_val: int) -> str:
+	"""Returns the narrowest unsigned integer type code able to store max_val.
+	"""
+	for type_code in ('H', 'I', 'L'):
+		if max_val < 2 ** (8 * array(type_code).itemsize):
+			return type_code
+	return 'Q'
+
+def _divide_array(type_code: str, arr: 'array[int]', divisor: int) -> 'array[float]':
+	"""Returns a new array of type_code containing each element of arr divided by divisor.
+	"""
+	return array(type_code, [val / divisor for val in arr])
 
 def _binners_similar(a: Binner, b: Binner) -> bool:
 	if a is b:
 		return True
+
+	a_fingerprint, b_fingerprint = a.fingerprint, b.fingerprint
+	if a_fingerprint is not None and b_fingerprint is not None:
+		return a_fingerprint == b_fingerprint
 	elif a.bins == b.bins:
 		return True
 	else:
-		# TODO: implement equality on Binner
 		# TODO: In Binner.__eq__ (base case) compare the bin_edges of the binners
 		return False
 
@@ -311,33 +512,107 @@ class HalvingBinnedCounters(_BinnedArray[int]):
 		max_bin: Optional[int] = None,
 		max_total: Optional[int] = None,
 	) -> None:
-		super(HalvingBinnedCounters, self).__init__(binner)
-
 		if max_bin is None and max_total is None:
 			raise ValueError('Either max_bin or max_total must be passed')
 
-		bin_max_inf: Union[int, float] = max_bin if max_bin is not None else math.inf
-		total_max_inf: Union[int, float] = max_total if max_total is not None else math.inf
+		# Bins never exceed max_bin (or max_total) for long, as they are
+		# halved right after. The narrowest unsigned type code fitting twice
+		# that bound is used, should a bin still overflow, the bins are
+		# widened to 'Q'.
+		self._type_code = _unsigned_type_code(2 * cast(int, max_bin if max_bin is not None else max_total))
+
+		super(HalvingBinnedCounters, self).__init__(binner)
+
+		self._factor: float = factor
+
+		self._bin_max: Union[int, float] = max_bin if max_bin is not None else math.inf
+		self._total_max: Union[int, float] = max_total if max_total is not None else math.inf
+
+	def __setitem__(self, num: int, val: int) -> None:
+		try:
+			super(HalvingBinnedCounters, self).__setitem__(num, val)
+		except OverflowError:
+			self._widen()
+			super(HalvingBinnedCounters, self).__setitem__(num, val)
+		if val > self._bin_max or self._total > self._total_max:
+			self._halve()
+
+	def increment(self, num: int, incr: int=1) -> None:
+		# The new value is kept in a local for the threshold check, instead of
+		# reading it back from the array.
+		bin = self._bin_of(num)
+		bins = self._bins
+		try:
+			val = bins[bin] + incr
+		except IndexError:
+			self._extend_and_set(bin, incr)
+			val = incr
+		else:
+			try:
+				bins[bin] = val
+			except OverflowError:
+				self._widen()
+				self._bins[bin] = val
+			self._total += incr
+		if val > self._bin_max or self._total > self._total_max:
+			self._halve()
+
+	def decrement(self, num: int, decr: int=1) -> None:
+		self.increment(num, -decr)
+
+	def increment_many(self, nums: Iterable[int], incr: int=1) -> None:
+		# Halving may be triggered by any single increment, hence bins are not
+		# updated in bulk.
+		increment = self.increment
+		for num in nums:
+			increment(num, incr)
+
+	def _extend_and_set(self, bin: int, val: int) -> None:
+		try:
+			super(HalvingBinnedCounters, self)._extend_and_set(bin, val)
+		except OverflowError:
+			self._widen()
+			super(HalvingBinnedCounters, self)._extend_and_set(bin, val)
+
+	def _widen(self) -> None:
+		"""Converts the bins to the widest unsigned type code.
 
-		old_increment = self._increment
-		old_set_bin = self._set_bin
+		If the bins already use the widest type code, the operation causing
+		the overflow fails again when retried.
+		"""
+		self._bins = array('Q', self._bins)
+
+	def _halve(self) -> None:
+		"""Multiplies all bins by factor (rounding down) and re-calculates total.
+		"""
+		self._total = _scale_int_array(self._bins, self._bins.typecode, self._factor)
 
-		def increment(bin: int, incr: int) -> None:
-			old_increment(bin, incr)
-			if self._bins[bin] > bin_max_inf or self._total > total_max_inf:
-				for i in range(len(self._bins)):
-					self._bins[i] = int(self._bins[i] * factor)
-				self._total = sum(self._bins)
 
-		def set_bin(bin: int, val: int) -> None:
-			old_set_bin(bin, val)
-			if self._bins[bin] > bin_max_inf or self._total > total_max_inf:
-				for i in range(len(self._bins)):
-					self._bins[i] = int(self._bins[i] * factor)
-				self._total = sum(self._bins)
+class _BoundedHalvingBinnedCounters(HalvingBinnedCounters, _BoundedBinnedArray[int]):
+	def __setitem__(self, num: int, val: int) -> None:
+		bin = self._bin_of(num)
+		old_val = self._bins[bin]
+		try:
+			self._bins[bin] = val
+		except OverflowError:
+			self._widen()
+			self._bins[bin] = val
+		self._total += val - old_val
+		if val > self._bin_max or self._total > self._total_max:
+			self._halve()
 
-		self._increment = increment
-		self._set_bin = set_bin
+	def increment(self, num: int, incr: int=1) -> None:
+		bin = self._bin_of(num)
+		bins = self._bins
+		val = bins[bin] + incr
+		try:
+			bins[bin] = val
+		except OverflowError:
+			self._widen()
+			self._bins[bin] = val
+		self._total += incr
+		if val > self._bin_max or self._total > self._total_max:
+			self._halve()
 
 
 class BinnedProbabilities(_ImmutableMixIn[float], _BinnedArray[float]):
@@ -350,10 +625,13 @@ class BinnedProbabilities(_ImmutableMixIn[float], _BinnedArray[float]):
 		return 1.0
 
 	@classmethod
-	def from_counters(cls, counters: BinnedCounters) -> 'BinnedProbabilities':
+	def from_counters(
+		cls,
+		counters: Union[BinnedCounters, HalvingBinnedCounters],
+	) -> 'BinnedProbabilities':
 		p = cls(counters.binner)
 		total = counters.total
-		p._bins = array(cls._type_code, (count / total for count in counters.bin_data))
+		p._bins = _divide_array(cls._type_code, counters.bin_data, total)
 		return p
 
 
@@ -384,19 +662,93 @@ class CountedProbabilities(BinnedProbabilities):
 			# bin (what about first and last bin of infinite size)?
 			raise ValueError('counters binning scheme is not matching this binning scheme')
 
-		total = _ewma_update_array(self._counters_bins, counters.bin_data, ewma_factor, int)
+		counters_bins = self._counters_bins
+		bin_data = counters.bin_data
+		if len(counters_bins) < len(bin_data):
+			counters_bins.extend(
+				itertools.repeat(0, len(bin_data) - len(counters_bins) + 1),
+			)
+
+		# The updated counters are normalised straight from the list returned,
+		# without reading them back from the array.
+		values = _ewma_update_int_array(counters_bins, bin_data, ewma_factor)
+		total = sum(values)
+		self._bins = array(self._type_code, [val / total for val in values])
+
+	def update_batch(self, counters_list: Sequence[BinnedCounters], ewma_factor: Optional[float]=None) -> None:
+		"""Update probabilities by combining with each of counters_list.
 
-		self._bins = array(self._type_code, (count / total for count in self._counters_bins))
+		Equivalent to calling update() for each element of counters_list in
+		order, but the probabilities are only re-calculated once. As with
+		_ModifyMixIn.update_batch(), the internally stored counters are only
+		truncated after combining all elements.
+
+		"""
+
+		if ewma_factor is None:
+			ewma_factor = self._ewma_factor
+			if ewma_factor is None:
+				raise ValueError('ewma_factor argument must be passed')
+
+		for counters in counters_list:
+			if not _binners_similar(counters.binner, self.binner):
+				raise ValueError('counters binning scheme is not matching this binning scheme')
+
+		if len(counters_list) == 0:
+			return
+
+		acc = _ewma_combine(
+			self._counters_bins,
+			[counters.bin_data for counters in counters_list],
+			ewma_factor,
+		)
+		values = [int(val) for val in acc]
+		self._counters_bins = array(self._counters_bins.typecode, values)
+		total = sum(values)
+		self._bins = array(self._type_code, [val / total for val in values])
 
 	@classmethod
 	def from_counters(
 		cls,
-		counters: BinnedCounters,
+		counters: Union[BinnedCounters, HalvingBinnedCounters],
 		ewma_factor: Optional[float] = None,
 	) -> 'CountedProbabilities':
 		p = cls(counters.binner, ewma_factor=ewma_factor)
 		total = counters.total
 		bin_data = counters.bin_data
-		p._counters_bins = array(bin_data.typecode, bin_data)
-		p._bins = array(cls._type_code, (count / total for count in bin_data))
+		p._counters_bins = array(p._counters_bins.typecode, bin_data)
+		p._bins = _divide_array(cls._type_code, bin_data, total)
 		return p
+
+
+class _BoundedBinnedCounters(BinnedCounters, _BoundedBinnedArray[int]):
+	pass
+
+
+class _BoundedBinnedFloats(BinnedFloats, _BoundedBinnedArray[float]):
+	pass
+
+
+class _BoundedBinnedProbabilities(BinnedProbabilities, _BoundedBinnedArray[float]):
+	pass
+
+
+class _BoundedCountedProbabilities(CountedProbabilities, _BoundedBinnedArray[float]):
+	pass
+
+
+# Maps each class to its variant used by _BinnedArray.__new__ for bounded
+# binners.
+_bounded_classes: Dict[type, type] = {
+	BinnedCounters: _BoundedBinnedCounters,
+	BinnedFloats: _BoundedBinnedFloats,
+	HalvingBinnedCounters: _BoundedHalvingBinnedCounters,
+	BinnedProbabilities: _BoundedBinnedProbabilities,
+	CountedProbabilities: _BoundedCountedProbabilities,
+}
+
+# Maps each bounded variant back to its public class, used by
+# _BinnedArray.__repr__.
+_public_classes: Dict[type, type] = {
+	bounded_cls: cls for cls, bounded_cls in _bounded_classes.items()
+}
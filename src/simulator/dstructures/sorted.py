@@ -1,8 +1,9 @@
 from sortedcontainers import SortedDict
-from typing import Any, Callable, Generic, Optional, TypeVar, TYPE_CHECKING
+from typing import Any, Callable, cast, Dict, Generic, Iterator, List, MutableMapping, Optional, overload, Tuple, TypeVar, TYPE_CHECKING, Union
 
 _KT = TypeVar('_KT')
 _VT = TypeVar('_VT')
+_T = TypeVar('_T')
 
 if TYPE_CHECKING:
 	class _BaseSortedDict(Generic[_KT, _VT], SortedDict[_KT, _VT]):
@@ -30,3 +31,113 @@ class SortedDefaultDict(_BaseSortedDict[_KT, _VT]):
 			self[key] = val
 			return val
 		raise KeyError(key)
+
+
+class LazySortedDefaultDict(Generic[_KT, _VT], MutableMapping[_KT, _VT]):
+	"""SortedDefaultDict variant which only sorts its keys when iterated.
+
+	Insertions and deletions are plain dict operations. The sorted list of
+	keys is rebuilt on the first iteration after the set of keys changed.
+	This is cheaper than SortedDefaultDict when many keys are inserted
+	between iterations. Range queries (irange() etc.) are not supported.
+
+	Like a dict, get(), pop() and setdefault() never call the default factory.
+	As with SortedDict, popitem() removes the item with the largest key.
+	Changing the set of keys while iterating raises RuntimeError.
+	"""
+	def __init__(
+		self,
+		default_factory: Optional[Callable[[], _VT]] = None,
+		*args: Any,
+		**kwargs: Any,
+	) -> None:
+		self._data: Dict[_KT, _VT] = dict(*args, **kwargs)
+		self._sorted_keys: Optional[List[_KT]] = None
+		self.default_factory: Optional[Callable[[], _VT]] = default_factory
+
+	def __getitem__(self, key: _KT) -> _VT:
+		try:
+			return self._data[key]
+		except KeyError:
+			return self.__missing__(key)
+
+	def __missing__(self, key: _KT) -> _VT:
+		if self.default_factory is not None:
+			val = self.default_factory()
+			self[key] = val
+			return val
+		raise KeyError(key)
+
+	def __setitem__(self, key: _KT, val: _VT) -> None:
+		if key not in self._data:
+			self._sorted_keys = None
+		self._data[key] = val
+
+	def __delitem__(self, key: _KT) -> None:
+		del self._data[key]
+		self._sorted_keys = None
+
+	def __contains__(self, key: object) -> bool:
+		return key in self._data
+
+	def __iter__(self) -> Iterator[_KT]:
+		return self._iter_keys(self._ensure_sorted_keys())
+
+	def _ensure_sorted_keys(self) -> List[_KT]:
+		sorted_keys = self._sorted_keys
+		if sorted_keys is None:
+			sorted_keys = cast(List[_KT], sorted(cast(Dict[Any, _VT], self._data)))
+			self._sorted_keys = sorted_keys
+		return sorted_keys
+
+	def _iter_keys(self, sorted_keys: List[_KT]) -> Iterator[_KT]:
+		n = len(sorted_keys)
+		for key in sorted_keys:
+			# Insertions and deletions reset _sorted_keys, popitem() shortens
+			# it in place.
+			if self._sorted_keys is not sorted_keys or len(self._data) != n:
+				raise RuntimeError('LazySortedDefaultDict changed size during iteration')
+			yield key
+
+	@overload
+	def get(self, key: _KT) -> Optional[_VT]: ...
+	@overload
+	def get(self, key: _KT, default: Union[_VT, _T]) -> Union[_VT, _T]: ...
+	def get(self, key: _KT, default: Optional[object] = None) -> Optional[object]:
+		return self._data.get(key, default)
+
+	_marker = object()
+
+	@overload
+	def pop(self, key: _KT) -> _VT: ...
+	@overload
+	def pop(self, key: _KT, default: Union[_VT, _T] = ...) -> Union[_VT, _T]: ...
+	def pop(self, key: _KT, default: object = _marker) -> object:
+		if key in self._data:
+			self._sorted_keys = None
+			return self._data.pop(key)
+		if default is self._marker:
+			raise KeyError(key)
+		return default
+
+	def setdefault(self, key: _KT, default: _VT) -> _VT:
+		if key not in self._data:
+			self[key] = default
+		return self._data[key]
+
+	def popitem(self) -> Tuple[_KT, _VT]:
+		"""Removes and returns the item with the largest key, like SortedDict.
+		"""
+		if len(self._data) == 0:
+			raise KeyError('popitem(): dictionary is empty')
+		sorted_keys = self._ensure_sorted_keys()
+		# Removing the last key keeps the sorted keys valid.
+		key = sorted_keys.pop()
+		return key, self._data.pop(key)
+
+	def clear(self) -> None:
+		self._data.clear()
+		self._sorted_keys = None
+
+	def __len__(self) -> int:
+		return len(self._data)
@@ -25,6 +25,24 @@ class EventIterator(Generic[_EventType]):
 	def __next__(self) -> _EventType:
 		return self.next()
 
+	def next_with_ts(self) -> Tuple[TimeStamp, _EventType]:
+		"""Returns the next event together with its time stamp.
+
+		The time stamp is only computed if the event has not been peeked at
+		before.
+		"""
+		self._ensure_next()
+		nxt = cast(Tuple[TimeStamp, _EventType], self._next)
+		self._next = None
+		return nxt
+
+	def peek_ts(self) -> TimeStamp:
+		"""Returns the time stamp of the next event without consuming it.
+		"""
+		self._ensure_next()
+		nxt = cast(Tuple[TimeStamp, _EventType], self._next)
+		return nxt[0]
+
 	def next_if_before(self, ts: TimeStamp) -> Optional[_EventType]:
 		self._ensure_next()
 		nxt = cast(Tuple[TimeStamp, _EventType], self._next)
@@ -47,10 +65,25 @@ class EventIterator(Generic[_EventType]):
 
 
 class EventMerger(Generic[_EventType]):
+	"""Merges multiple event streams into a single stream ordered by key.
+
+	Each stream must already be ordered by key. Events with equal keys are
+	yielded in the order in which they were retrieved from their streams.
+
+	For streams which are EventIterator instances, the time stamp is taken
+	from next_with_ts(), reusing a time stamp cached when peeking. The key of
+	such a stream must hence agree with key.
+	"""
+
 	def __init__(self, streams: Iterable[Iterable[_EventType]], key: Callable[[_EventType], TimeStamp]):
 		self._key: Callable[[_EventType], TimeStamp] = key
 		self._event_index: int = 0
-		self._heap: List[Tuple[TimeStamp, int, _EventType, Iterator[_EventType]]] = []
+		# Heap entries are mutable lists [ts, event_index, ev, it, next_with_ts]
+		# which are updated in place and re-sifted for each consumed event.
+		# next_with_ts is the bound EventIterator method or None for other
+		# iterators. The event index is unique, so ev and it are never
+		# compared.
+		self._heap: List[List[Any]] = []
 
 		for stream in streams:
 			it = iter(stream)
@@ -60,29 +93,44 @@ class EventMerger(Generic[_EventType]):
 		return self
 
 	def __next__(self) -> _EventType:
+		heap = self._heap
 		try:
-			_, _, ev, it = self._heap[0]
+			entry = heap[0]
 		except IndexError:
 			raise StopIteration()
 
+		ev: _EventType = entry[2]
+
+		next_with_ts = entry[4]
 		try:
-			next_ev = next(it)
+			if next_with_ts is not None:
+				next_ts, next_ev = next_with_ts()
+			else:
+				next_ev = next(entry[3])
+				next_ts = self._key(next_ev)
 		except StopIteration:
-			heapq.heappop(self._heap)
+			heapq.heappop(heap)
 		else:
-			heapq.heapreplace(self._heap, (
-				self._key(next_ev), self._event_index, next_ev, it,
-			))
+			entry[0] = next_ts
+			entry[1] = self._event_index
+			entry[2] = next_ev
+			heapq.heapreplace(heap, entry)
 			self._event_index += 1
 
 		return ev
 
 	def _push_next(self, it: Iterator[_EventType]) -> None:
+		next_with_ts: Optional[Callable[[], Tuple[TimeStamp, _EventType]]] = None
 		try:
-			ev = next(it)
+			if isinstance(it, EventIterator):
+				next_with_ts = it.next_with_ts
+				ts, ev = next_with_ts()
+			else:
+				ev = next(it)
+				ts = self._key(ev)
 		except StopIteration:
 			return
-		heapq.heappush(self._heap, (
-			self._key(ev), self._event_index, ev, it,
-		))
+		heapq.heappush(self._heap, [
+			ts, self._event_index, ev, it, next_with_ts,
+		])
 		self._event_index += 1
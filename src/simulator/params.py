@@ -1,7 +1,10 @@
 from abc import ABC, abstractmethod
 from contextlib import contextmanager
+from functools import lru_cache
+import io
+import re
 from shlex import shlex
-from typing import Any, Callable, Dict, Generic, Iterable, Iterator, List, Optional, TypeVar, Union
+from typing import Any, Callable, cast, Dict, Generic, Iterable, Iterator, List, Optional, Tuple, TypeVar, Union
 
 _T = TypeVar('_T')
 
@@ -22,6 +25,8 @@ access_size&dirname(top=1) - sub-parseable string
 
 
 class Field(ABC):
+	__slots__ = ['_name']
+
 	def __init__(
 		self,
 		name: str,
@@ -42,8 +47,17 @@ class Field(ABC):
 		"""
 		raise NotImplementedError
 
+	def parse_str(self, value: str) -> 'EvaluatedField[Any]':
+		"""Interprets value, the text of a field's value with quotes removed.
+
+		The default implementation runs parse on a fresh shlex reading value.
+		"""
+		return self.parse(shlex(value, posix=True))
+
 
 class EvaluatedField(Generic[_T]):
+	__slots__ = ['_field', '_value', '_meta_data']
+
 	def __init__(
 		self,
 		field: Field,
@@ -52,7 +66,8 @@ class EvaluatedField(Generic[_T]):
 	):
 		self._field: Field = field
 		self._value: _T = value
-		self._meta_data: Dict[str, Any] = meta_data if meta_data is not None else {}
+		# Allocated lazily on first access
+		self._meta_data: Optional[Dict[str, Any]] = meta_data
 
 	@property
 	def field(self) -> Field:
@@ -68,10 +83,14 @@ class EvaluatedField(Generic[_T]):
 
 	@property
 	def meta_data(self) -> Dict[str, Any]:
+		if self._meta_data is None:
+			self._meta_data = {}
 		return self._meta_data
 
 
 class SimpleField(Generic[_T], Field):
+	__slots__ = ['_conv']
+
 	def __init__(
 		self,
 		name: str,
@@ -81,9 +100,13 @@ class SimpleField(Generic[_T], Field):
 		self._conv: Callable[[str], _T] = conv
 
 	def _read(self, lex: shlex) -> str:
-		with amend_shlex(
+		plain = _read_plain(lex, ',')
+		if plain is not None:
+			return plain
+
+		with _swap_shlex(
 			lex,
-			add_wordchars = '!$%&/()[]{}<>?_-.;:#+*',
+			wordchars = _add_chars(lex.wordchars, '!$%&/()[]{}<>?_-.;:#+*'),
 			commenters = '',
 			whitespace = '',
 		):
@@ -92,19 +115,164 @@ class SimpleField(Generic[_T], Field):
 	def parse(self, lex: shlex) -> EvaluatedField[_T]:
 		return EvaluatedField(self, self._conv(self._read(lex)))
 
+	def parse_str(self, value: str) -> EvaluatedField[_T]:
+		return EvaluatedField(self, self._conv(value))
+
+	def __eq__(self, other: object) -> bool:
+		if not isinstance(other, SimpleField):
+			return NotImplemented
+		return self._name == other._name and self._conv == other._conv
+
+	def __hash__(self) -> int:
+		return hash((self._name, self._conv))
+
+
+@lru_cache(maxsize=32)
+def _add_chars(chars: str, add_chars: str) -> str:
+	"""Returns chars extended by the characters of add_chars not yet in chars.
+	"""
+	present = set(chars)
+	return chars + ''.join(c for c in dict.fromkeys(add_chars) if c not in present)
+
+@contextmanager
+def _swap_shlex(lex: shlex, wordchars: str, commenters: str, whitespace: str) -> Iterator[shlex]:
+	"""Lightweight variant of amend_shlex setting final control values.
+	"""
+	orig_wordchars, orig_commenters, orig_whitespace = lex.wordchars, lex.commenters, lex.whitespace
+	lex.wordchars, lex.commenters, lex.whitespace = wordchars, commenters, whitespace
+	try:
+		yield lex
+	finally:
+		lex.wordchars, lex.commenters, lex.whitespace = orig_wordchars, orig_commenters, orig_whitespace
+
+def _read_plain(lex: shlex, until_char: str) -> Optional[str]:
+	"""Reads the raw text up to until_char if it requires no unescaping.
+
+	Returns None without consuming anything from lex, if the text contains
+	quotes or escape characters or lex is in a state where its stream can not
+	be read directly.
+	"""
+	instream = lex.instream
+	# pushback and state are not part of shlex's typed interface
+	lex_internals: Any = lex
+	if not isinstance(instream, io.StringIO) or lex.punctuation_chars:
+		return None
+	elif lex_internals.pushback or lex_internals.state not in (' ', None):
+		return None
+
+	pos = instream.tell()
+	rest = instream.read()
+	end = rest.find(until_char)
+	if end == -1:
+		end = len(rest)
+	value = rest[:end]
+
+	special_chars = lex.quotes + lex.escape
+	if any(c in special_chars for c in value):
+		instream.seek(pos)
+		return None
+
+	instream.seek(pos + end)
+	lex.lineno += value.count('\n')
+	return value
+
+
+# Characters which shlex treats specially when reading user args. If none of
+# these are present, splitting on ',' and '=' yields the same result.
+_SHLEX_SPECIAL_CHARS = frozenset('"\'\\#')
+
+# Characters for which only the shlex path reproduces shlex's handling
+# (comments and escapes). User args containing quotes but none of these are
+# split with _USER_ARG_RE.
+_SHLEX_ONLY_CHARS = frozenset('\\#')
+
+# One name=value pair of user args, followed by ',' or the end of the string.
+# value may contain double and single quoted sections.
+_USER_ARG_RE = re.compile(
+	r'''\s*(?P<name>\w*)\s*(?:=(?P<value>(?:"[^"]*"|'[^']*'|[^,"'])*))?(?:,|$)''',
+)
+
+# Sections of a value as matched by _USER_ARG_RE's value group.
+_VALUE_SECTION_RE = re.compile(
+	r'''"(?P<double>[^"]*)"|'(?P<single>[^']*)'|(?P<plain>[^"']+)''',
+)
+
+def _unquote(value: str) -> str:
+	"""Removes the quotes from value, which contains no escapes.
+	"""
+	return ''.join(m[cast(str, m.lastgroup)] for m in _VALUE_SECTION_RE.finditer(value))
+
+@lru_cache(maxsize=32)
+def _build_fields_dict(fields: Tuple[Field, ...]) -> Dict[str, Field]:
+	return dict((field.name, field) for field in fields)
 
 def parse_user_args(user_args: str, dest: Any, fields: Iterable[Field]) -> None:
 	"""Parse user args according to fields and store values in dest.
 	"""
+	for name, value in _parse_to_pairs(user_args, tuple(fields)):
+		setattr(dest, name, value)
+
+@lru_cache(maxsize=128)
+def _parse_to_pairs(user_args: str, fields: Tuple[Field, ...]) -> Tuple[Tuple[str, Any], ...]:
+	"""Parses user args into (name, value) pairs of evaluated fields.
+
+	Results are memoised, fields comparing equal (such as SimpleFields with
+	the same name and conversion) share cache entries.
+	"""
+	fields_dict = _build_fields_dict(fields)
+
+	if _SHLEX_SPECIAL_CHARS.isdisjoint(user_args):
+		return _parse_to_pairs_fast(user_args, fields_dict)
+	elif _SHLEX_ONLY_CHARS.isdisjoint(user_args):
+		pairs = _parse_to_pairs_quoted(user_args, fields_dict)
+		if pairs is not None:
+			return pairs
+
+	return _parse_to_pairs_shlex(user_args, fields_dict)
+
+def _parse_to_pairs_quoted(user_args: str, fields_dict: Dict[str, Field]) -> Optional[Tuple[Tuple[str, Any], ...]]:
+	"""Parses user args containing quotes, but no escapes or comments.
+
+	Returns None for user args which are not plain name=value pairs, such as
+	quoted names, quoted ',' or invalid input. These are left to the shlex
+	path, which also raises the errors.
+	"""
+	pairs: List[Tuple[str, Any]] = []
+
+	pos, end = 0, len(user_args)
+	while pos < end:
+		m = _USER_ARG_RE.match(user_args, pos)
+		if m is None:
+			return None
+
+		name, value = m['name'], m['value']
+		if value is None and len(name) == 0 and not user_args[pos:].strip():
+			# Trailing whitespace
+			break
+		elif name not in fields_dict or value is None or ',' in value:
+			# The shlex path treats a quoted ',' as a separator
+			return None
+
+		evaluated_field = fields_dict[name].parse_str(_unquote(value))
+		pairs.append((evaluated_field.name, evaluated_field.value))
+
+		pos = m.end()
+
+	return tuple(pairs)
+
+def _parse_to_pairs_shlex(user_args: str, fields_dict: Dict[str, Field]) -> Tuple[Tuple[str, Any], ...]:
+	"""Parses user args by driving a shlex lexer.
+
+	Used for user args containing comments ('#') or escapes ('\\').
+	"""
 	lex = shlex(user_args, posix=True)
-	fields_dict = dict((field.name, field) for field in fields)
-	evaluated_fields: List[EvaluatedField[Any]] = []
+	pairs: List[Tuple[str, Any]] = []
 
 	tok = lex.get_token()
 	while tok != lex.eof:
 		if tok == lex.eof:
 			raise Exception('unexpected eof')
-		elif len(tok) == 0:
+		elif not tok:
 			raise Exception(f'name is too short {tok!r}')
 		elif tok not in fields_dict:
 			raise Exception(f'unknown name {tok!r}')
@@ -116,8 +284,7 @@ def parse_user_args(user_args: str, dest: Any, fields: Iterable[Field]) -> None:
 			raise Exception(f'not expected {tok!r}')
 
 		evaluated_field = fields_dict[name].parse(lex)
-		evaluated_fields.append(evaluated_field)
-		setattr(dest, evaluated_field.name, evaluated_field.value)
+		pairs.append((evaluated_field.name, evaluated_field.value))
 
 		tok = lex.get_token()
 		if tok == lex.eof:
@@ -127,7 +294,35 @@ def parse_user_args(user_args: str, dest: Any, fields: Iterable[Field]) -> None:
 
 		tok = lex.get_token()
 
-	return
+	return tuple(pairs)
+
+def _parse_to_pairs_fast(user_args: str, fields_dict: Dict[str, Field]) -> Tuple[Tuple[str, Any], ...]:
+	"""Parses user args containing no quotes, escapes or comments.
+	"""
+	if not user_args.strip():
+		return ()
+
+	raw_pairs = user_args.split(',')
+	if len(raw_pairs) > 1 and not raw_pairs[-1].strip():
+		# Trailing ',' is accepted
+		del raw_pairs[-1]
+
+	pairs: List[Tuple[str, Any]] = []
+
+	for raw_pair in raw_pairs:
+		name, sep, value = raw_pair.partition('=')
+		name = name.strip()
+		if len(name) == 0:
+			raise Exception(f'name is too short {name!r}')
+		elif name not in fields_dict:
+			raise Exception(f'unknown name {name!r}')
+		elif not sep:
+			raise Exception('unexpected eof')
+
+		evaluated_field = fields_dict[name].parse_str(value)
+		pairs.append((evaluated_field.name, evaluated_field.value))
+
+	return tuple(pairs)
 
 @contextmanager
 def amend_shlex(
@@ -153,64 +348,32 @@ def amend_shlex(
 ) -> Iterator[shlex]:
 	"""Context manager temporarily changing shlex control variables.
 	"""
-	orig_commenters = lex.commenters
-	orig_wordchars = lex.wordchars
-	orig_whitespace = lex.whitespace
-	orig_escape = lex.escape
-	orig_quotes = lex.quotes
-	orig_escapedquotes = lex.escapedquotes
-
-	if add_commenters is not None:
-		lex.commenters += ''.join(c for c in add_commenters if c not in lex.commenters)
-	if rm_commenters is not None:
-		lex.commenters = ''.join(c for c in lex.commenters if c not in rm_commenters)
-	if commenters is not None:
-		lex.commenters = commenters
-
-	if add_wordchars is not None:
-		lex.wordchars += ''.join(c for c in add_wordchars if c not in lex.wordchars)
-	if rm_wordchars is not None:
-		lex.wordchars = ''.join(c for c in lex.wordchars if c not in rm_wordchars)
-	if wordchars is not None:
-		lex.wordchars = wordchars
-
-	if add_whitespace is not None:
-		lex.whitespace += ''.join(c for c in add_whitespace if c not in lex.whitespace)
-	if rm_whitespace is not None:
-		lex.whitespace = ''.join(c for c in lex.whitespace if c not in rm_whitespace)
-	if whitespace is not None:
-		lex.whitespace = whitespace
-
-	if add_escape is not None:
-		lex.escape += ''.join(c for c in add_escape if c not in lex.escape)
-	if rm_escape is not None:
-		lex.escape = ''.join(c for c in lex.escape if c not in rm_escape)
-	if escape is not None:
-		lex.escape = escape
-
-	if add_quotes is not None:
-		lex.quotes += ''.join(c for c in add_quotes if c not in lex.quotes)
-	if rm_quotes is not None:
-		lex.quotes = ''.join(c for c in lex.quotes if c not in rm_quotes)
-	if quotes is not None:
-		lex.quotes = quotes
-
-	if add_escapedquotes is not None:
-		lex.escapedquotes += ''.join(c for c in add_escapedquotes if c not in lex.escapedquotes)
-	if rm_escapedquotes is not None:
-		lex.escapedquotes = ''.join(c for c in lex.escapedquotes if c not in rm_escapedquotes)
-	if escapedquotes is not None:
-		lex.escapedquotes = escapedquotes
+	amendments = (
+		('commenters', add_commenters, rm_commenters, commenters),
+		('wordchars', add_wordchars, rm_wordchars, wordchars),
+		('whitespace', add_whitespace, rm_whitespace, whitespace),
+		('escape', add_escape, rm_escape, escape),
+		('quotes', add_quotes, rm_quotes, quotes),
+		('escapedquotes', add_escapedquotes, rm_escapedquotes, escapedquotes),
+	)
+	orig_values = [(attr, getattr(lex, attr)) for attr, _, _, _ in amendments]
+
+	for attr, add_chars, rm_chars, chars in amendments:
+		if chars is not None:
+			setattr(lex, attr, chars)
+		elif add_chars is not None or rm_chars is not None:
+			value: str = getattr(lex, attr)
+			if add_chars is not None:
+				value = _add_chars(value, add_chars)
+			if rm_chars is not None:
+				value = value.translate(dict.fromkeys(map(ord, rm_chars)))
+			setattr(lex, attr, value)
 
 	try:
 		yield lex
 	finally:
-		lex.commenters = orig_commenters
-		lex.wordchars = orig_wordchars
-		lex.whitespace = orig_whitespace
-		lex.escape = orig_escape
-		lex.quotes = orig_quotes
-		lex.escapedquotes = orig_escapedquotes
+		for attr, orig_value in orig_values:
+			setattr(lex, attr, orig_value)
 
 def tokens_until(lex: shlex, until_tok: Union[str, Iterable[str]]) -> Iterator[str]:
 	until_toks = [until_tok,] if isinstance(until_tok, str) else list(until_tok)
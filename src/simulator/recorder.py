@@ -1,15 +1,18 @@
 import abc
+from array import array
 from enum import auto, Enum
 from io import BufferedIOBase, SEEK_SET, SEEK_CUR, SEEK_END
+import itertools
+import mmap
 import orjson
 from os import fstat, PathLike
-from typing import Any, Callable, cast, Dict, Iterable, Iterator, Optional, BinaryIO, Tuple, TYPE_CHECKING, Union
+import struct
+from typing import Any, Callable, cast, Dict, Iterable, Iterator, List, Optional, BinaryIO, Sequence, Tuple, TYPE_CHECKING, Union
 
 from .distributor import AccessAssignment
 from .cache.processor import AccessInfo
 from .cache.accesses import filter_cache_processor
-from .workload import Access
-from .utils import consume
+from .workload import Access, FileID, PartSpec
 
 
 if TYPE_CHECKING:
@@ -24,6 +27,35 @@ class _EndOfFile(Exception):
 	pass
 
 
+# Files may be written in one of two formats:
+#
+# JSON lines: One JSON object per line. This is the default format, files
+#     have no header.
+# Binary: Files start with _BINARY_HEADER, the last byte of which is the
+#     format version. Each record is framed as u32 length, record, u32 length.
+#     The trailing length allows reading records in reverse order. Records
+#     are encoded using struct with little-endian byte order, see
+#     _encode_assgnm() and _encode_access_info().
+#
+# The reading functions detect the format by checking for the header.
+
+_BINARY_HEADER = b'\x00htcsim\x01'
+
+_frame_length = struct.Struct('<I')
+_access_head = struct.Struct('<QH')
+_cache_proc = struct.Struct('<I')
+_assgnm_head = struct.Struct('<IQH') # _cache_proc followed by _access_head
+_count = struct.Struct('<I')
+_access_info_stats = struct.Struct('<?QQQQQ')
+_file_length = struct.Struct('<H')
+
+# Number of bytes collected before writing records to the file.
+_WRITE_BATCH_SIZE = 1 << 20
+
+# Number of bytes read at once when counting JSON lines records.
+_COUNT_CHUNK_SIZE = 1 << 20
+
+
 class _ReplayStateAccessor(object):
 	def __init__(self, file: BinaryIO) -> None:
 		self._file: BinaryIO = file
@@ -49,12 +81,108 @@ def reverse_replay_path(path: _PathType) -> Iterator[AccessAssignment]:
 		for assgnm in reverse_replay(file):
 			yield assgnm
 
+class AssignmentBatch(object):
+	"""A batch of access assignments stored as parallel columns.
+
+	The i-th assignment consists of access_ts[i], files[i] and cache_proc[i].
+	Its parts are (parts_ind[j], parts_size[j]) for j in
+	range(parts_offset[i], parts_offset[i + 1]).
+	"""
+	__slots__ = ['access_ts', 'files', 'cache_proc', 'parts_offset', 'parts_ind', 'parts_size']
+
+	def __init__(self) -> None:
+		self.access_ts: 'array[int]' = array('Q')
+		self.files: List[FileID] = []
+		self.cache_proc: 'array[int]' = array('I')
+		self.parts_offset: 'array[int]' = array('Q', [0])
+		self.parts_ind: 'array[int]' = array('I')
+		self.parts_size: 'array[int]' = array('Q')
+
+	def __len__(self) -> int:
+		return len(self.access_ts)
+
+	def __iter__(self) -> Iterator[AccessAssignment]:
+		parts_offset, parts_ind, parts_size = self.parts_offset, self.parts_ind, self.parts_size
+		for ind, (access_ts, file, cache_proc) in enumerate(zip(self.access_ts, self.files, self.cache_proc)):
+			start, end = parts_offset[ind], parts_offset[ind + 1]
+			yield AccessAssignment(
+				Access(access_ts, file, list(zip(parts_ind[start:end], parts_size[start:end]))),
+				cache_proc,
+			)
+
+
+def replay_batch(file: BinaryIO, batch_size: int = 65536) -> Iterator[AssignmentBatch]:
+	"""Reads the access assignments in file as batches of up to batch_size.
+
+	Unlike replay(), no objects are created per assignment.
+	"""
+	if _is_binary(file):
+		read_into = _read_into_batch_bin
+	else:
+		file.seek(0, SEEK_SET)
+		read_into = _read_into_batch
+
+	while True:
+		batch = AssignmentBatch()
+		read_into(file, batch, batch_size)
+		if len(batch) == 0:
+			return
+		yield batch
+
+def replay_batch_path(path: _PathType, batch_size: int = 65536) -> Iterator[AssignmentBatch]:
+	with open(path, mode='rb') as file:
+		for batch in replay_batch(file, batch_size=batch_size):
+			yield batch
+
+def _read_into_batch(file: BinaryIO, batch: AssignmentBatch, n: int) -> None:
+	access_ts, files, cache_proc = batch.access_ts, batch.files, batch.cache_proc
+	parts_offset, parts_ind, parts_size = batch.parts_offset, batch.parts_ind, batch.parts_size
+
+	for line in itertools.islice(file, n):
+		dct = orjson.loads(line)
+		access = dct['access']
+		access_ts.append(access['access_ts'])
+		files.append(access['file'])
+		cache_proc.append(dct['cache_proc'])
+		for part_ind, size in access['parts']:
+			parts_ind.append(part_ind)
+			parts_size.append(size)
+		parts_offset.append(len(parts_ind))
+
+def _read_into_batch_bin(file: BinaryIO, batch: AssignmentBatch, n: int) -> None:
+	access_ts, files, cache_proc = batch.access_ts, batch.files, batch.cache_proc
+	parts_offset, parts_ind, parts_size = batch.parts_offset, batch.parts_ind, batch.parts_size
+
+	for _ in range(n):
+		try:
+			buf = _read_frame(file)
+		except _EndOfFile:
+			return
+
+		# Same layout as decoded by _decode_assgnm()
+		record_cache_proc, record_access_ts, file_length = _assgnm_head.unpack_from(buf, 0)
+		offset = _assgnm_head.size
+		access_ts.append(record_access_ts)
+		files.append(buf[offset:offset + file_length].decode())
+		cache_proc.append(record_cache_proc)
+
+		offset += file_length
+		count, = _count.unpack_from(buf, offset)
+		flat = _parts_struct(count).unpack_from(buf, offset)
+		parts_ind.extend(flat[1::2])
+		parts_size.extend(flat[2::2])
+		parts_offset.append(len(parts_ind))
+
 def _replay(
 	file: BinaryIO,
 	begin_pos: int = 0,
 	end_pos: Optional[int] = None,
 	state_cb: Optional[Callable[[_ReplayStateAccessor], None]] = None,
 ) -> Iterator[AccessAssignment]:
+	binary = _is_binary(file)
+	if binary:
+		begin_pos = max(begin_pos, len(_BINARY_HEADER))
+
 	file.seek(begin_pos, SEEK_SET)
 
 	# This hacky workaround exposes the internal state of the _replay()
@@ -68,10 +196,23 @@ def _replay(
 		# The outer function executes normally, meaning that state_cb is
 		# called immediately and not during the first next(.) call.
 
+		if end_pos is not None and file.tell() >= end_pos:
+			# Empty range
+			return
+
+		if not binary:
+			# Iterating the file yields lines without a Python-level
+			# readline() call per record.
+			for line in file:
+				yield _dct_to_assgnm(orjson.loads(line))
+				if end_pos is not None and file.tell() >= end_pos:
+					break
+			return
+
 		while True:
 			try:
 				# TODO will over-read: should abort at end_pos
-				yield _read_assgnm(file)
+				yield _read_assgnm_bin(file)
 				if end_pos is not None and file.tell() >= end_pos:
 					break
 			except _EndOfFile:
@@ -84,9 +225,18 @@ def _reverse_replay(
 	begin_pos: int = 0,
 	end_pos: Optional[int] = None,
 ) -> Iterator[AccessAssignment]:
-	for line in _reverse_read_jsonl(file, begin_pos=begin_pos, end_pos=end_pos):
-		dct = orjson.loads(line)
-		yield _dct_to_assgnm(dct)
+	if _is_binary(file):
+		begin_pos = max(begin_pos, len(_BINARY_HEADER))
+		for frame in _reverse_read_frames(file, begin_pos=begin_pos, end_pos=end_pos):
+			yield _decode_assgnm(frame)
+	else:
+		for line in _reverse_read_jsonl(file, begin_pos=begin_pos, end_pos=end_pos):
+			dct = orjson.loads(line)
+			yield _dct_to_assgnm(dct)
+
+def _is_binary(file: BinaryIO) -> bool:
+	file.seek(0, SEEK_SET)
+	return file.read(len(_BINARY_HEADER)) == _BINARY_HEADER
 
 def _chunk_size(file: BinaryIO) -> int:
 	chunk_size = 0
@@ -108,6 +258,49 @@ def _reverse_read_jsonl(
 	file: BinaryIO,
 	begin_pos: int = 0,
 	end_pos: Optional[int] = None,
+) -> Iterator[bytes]:
+	try:
+		mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+	except (AttributeError, OSError, ValueError):
+		# Not backed by a file descriptor (e.g. BytesIO) or empty
+		pass
+	else:
+		with mm:
+			yield from _reverse_read_jsonl_mmap(mm, begin_pos, end_pos)
+		return
+
+	yield from _reverse_read_jsonl_chunked(file, begin_pos, end_pos)
+
+_whitespace = b' \t\n\r\x0b\x0c'
+
+def _reverse_read_jsonl_mmap(
+	mm: mmap.mmap,
+	begin_pos: int = 0,
+	end_pos: Optional[int] = None,
+) -> Iterator[bytes]:
+	"""Yields the lines of a memory-mapped file in reverse order.
+
+	Whitespace at the end of lines is stripped and empty lines are skipped,
+	matching _reverse_read_jsonl_chunked().
+	"""
+	end = len(mm) if end_pos is None else end_pos
+
+	while True:
+		while end > begin_pos and mm[end - 1] in _whitespace:
+			end -= 1
+		if end <= begin_pos:
+			return
+
+		start = mm.rfind(b'\n', begin_pos, end) + 1
+		if start == 0:
+			start = begin_pos
+		yield mm[start:end]
+		end = start
+
+def _reverse_read_jsonl_chunked(
+	file: BinaryIO,
+	begin_pos: int = 0,
+	end_pos: Optional[int] = None,
 ) -> Iterator[bytes]:
 	if end_pos is not None:
 		file.seek(end_pos, SEEK_SET)
@@ -157,44 +350,298 @@ def _reverse_read_jsonl(
 			if exhausted and start_ind == 0:
 				return
 
-def record(file: BinaryIO, it: Iterable[AccessAssignment]) -> None:
-	for access in it:
-		_write_assgnm(file, access)
+def _reverse_read_frames(
+	file: BinaryIO,
+	begin_pos: int = 0,
+	end_pos: Optional[int] = None,
+) -> Iterator[bytes]:
+	"""Yields the records of a binary file in reverse order.
+
+	Each record is yielded with its leading length field removed, the
+	trailing length field is retained.
+	"""
+	if end_pos is not None:
+		pos = file.seek(end_pos, SEEK_SET)
+	else:
+		pos = file.seek(0, SEEK_END)
+
+	chunk_size = _chunk_size(file)
+
+	# buf holds the bytes of the file starting at pos. Frames in buf[:end]
+	# have not been yielded yet.
+	buf = b''
+	end = 0
+
+	while True:
+		if end >= _frame_length.size:
+			length, = _frame_length.unpack_from(buf, end - _frame_length.size)
+			start = end - length - 2 * _frame_length.size
+			if start >= 0:
+				yield buf[start + _frame_length.size:end]
+				end = start
+				continue
+
+		if pos <= begin_pos:
+			if end == 0:
+				return
+			raise ValueError('Truncated record at the beginning of the file')
 
-def record_path(path: _PathType, it: Iterable[AccessAssignment]) -> None:
+		# Read chunk from file (in reverse direction)
+		new_pos = max(begin_pos, pos - chunk_size)
+		file.seek(new_pos, SEEK_SET)
+		buf = file.read(pos - new_pos) + buf[:end]
+		end = len(buf)
+		pos = new_pos
+
+def _count_records(
+	file: BinaryIO,
+	begin_pos: int = 0,
+	end_pos: Optional[int] = None,
+) -> int:
+	"""Counts the records in file[begin_pos:end_pos] without decoding them.
+	"""
+	count = 0
+
+	if _is_binary(file):
+		pos = file.seek(max(begin_pos, len(_BINARY_HEADER)), SEEK_SET)
+		while end_pos is None or pos < end_pos:
+			head = file.read(_frame_length.size)
+			if len(head) == 0:
+				break
+			length, = _frame_length.unpack(head)
+			pos = file.seek(length + _frame_length.size, SEEK_CUR)
+			count += 1
+		return count
+
+	file.seek(begin_pos, SEEK_SET)
+	remaining = -1 if end_pos is None else end_pos - begin_pos
+	last = b''
+	while remaining != 0:
+		chunk = file.read(_COUNT_CHUNK_SIZE if remaining < 0 else min(remaining, _COUNT_CHUNK_SIZE))
+		if len(chunk) == 0:
+			break
+		count += chunk.count(b'\n')
+		last = chunk[-1:]
+		if remaining > 0:
+			remaining -= len(chunk)
+
+	if last not in (b'', b'\n'):
+		# Last line is not terminated
+		count += 1
+
+	return count
+
+def _bisect_lines(file: BinaryIO, key: Callable[[AccessAssignment], int], target: int) -> int:
+	"""Returns the position of the first record with key(assgnm) >= target.
+
+	file must be in the JSON lines format and the keys of its records must be
+	non-decreasing. If there is no such record, the end of the file is
+	returned. Only O(log(file size)) records are decoded.
+	"""
+	def line_start(pos: int) -> int:
+		"""Seeks to and returns the start of the first line at or after pos.
+		"""
+		if pos == 0:
+			return file.seek(0, SEEK_SET)
+		file.seek(pos - 1, SEEK_SET)
+		file.readline()
+		return file.tell()
+
+	lo, hi = 0, file.seek(0, SEEK_END)
+	while lo < hi:
+		mid = (lo + hi) // 2
+		line_start(mid)
+		line = file.readline()
+		if len(line) == 0 or key(_dct_to_assgnm(orjson.loads(line))) >= target:
+			hi = mid
+		else:
+			lo = mid + 1
+	return line_start(lo)
+
+def _bisect_frames(
+	file: BinaryIO,
+	offsets: Sequence[int],
+	key: Callable[[AccessAssignment], int],
+	target: int,
+) -> int:
+	"""Returns the index of the first frame with key(assgnm) >= target.
+
+	offsets are the frame positions as returned by _frame_offsets(), the keys
+	of the records must be non-decreasing. If there is no such frame,
+	len(offsets) - 1 is returned.
+	"""
+	lo, hi = 0, len(offsets) - 1
+	while lo < hi:
+		mid = (lo + hi) // 2
+		file.seek(offsets[mid], SEEK_SET)
+		if key(_read_assgnm_bin(file)) >= target:
+			hi = mid
+		else:
+			lo = mid + 1
+	return lo
+
+def _frame_offsets(file: BinaryIO) -> List[int]:
+	"""Returns the positions of all frames in a binary file and its end.
+	"""
+	offsets: List[int] = []
+	pos = file.seek(len(_BINARY_HEADER), SEEK_SET)
+	while True:
+		offsets.append(pos)
+		head = file.read(_frame_length.size)
+		if len(head) == 0:
+			return offsets
+		length, = _frame_length.unpack(head)
+		pos = file.seek(length + _frame_length.size, SEEK_CUR)
+
+def record(file: BinaryIO, it: Iterable[AccessAssignment], binary: bool = False) -> None:
+	write_assgnm = _write_assgnm
+	buf = bytearray()
+	if binary:
+		buf += _BINARY_HEADER
+		write_assgnm = _write_assgnm_bin
+
+	# Records are collected in buf and written to file in batches.
+	try:
+		for access in it:
+			write_assgnm(buf, access)
+			if len(buf) >= _WRITE_BATCH_SIZE:
+				file.write(buf)
+				buf.clear()
+	finally:
+		file.write(buf)
+
+def record_path(path: _PathType, it: Iterable[AccessAssignment], binary: bool = False) -> None:
 	with open(path, mode='wb') as file:
-		record(file, it)
+		record(file, it, binary=binary)
 
 def passthrough_record(
 	file: BinaryIO,
 	it: Iterable[AccessAssignment],
+	binary: bool = False,
 ) -> Iterator[AccessAssignment]:
+	write_assgnm = _write_assgnm
+	if binary:
+		file.write(_BINARY_HEADER)
+		write_assgnm = _write_assgnm_bin
+
+	# Each record is written before it is yielded, the caller may stop
+	# iterating (and close file) at any point.
+	buf = bytearray()
 	for access in it:
-		_write_assgnm(file, access)
+		write_assgnm(buf, access)
+		file.write(buf)
+		buf.clear()
 		yield access
 
-def _read_assgnm(file: BinaryIO) -> AccessAssignment:
-	l = file.readline()
-	if len(l) == 0:
+def _write_assgnm(buf: bytearray, assgnm: AccessAssignment) -> None:
+	access = assgnm.access
+	buf += _assgnm_json_line % (
+		access.access_ts,
+		orjson.dumps(access.file),
+		orjson.dumps(access.parts),
+		assgnm.cache_proc,
+	)
+
+def _read_assgnm_bin(file: BinaryIO) -> AccessAssignment:
+	return _decode_assgnm(_read_frame(file))
+
+def _write_assgnm_bin(buf: bytearray, assgnm: AccessAssignment) -> None:
+	_write_frame(buf, _encode_assgnm(assgnm))
+
+def _read_frame(file: BinaryIO) -> bytes:
+	"""Reads the next record, the trailing length field is retained.
+	"""
+	head = file.read(_frame_length.size)
+	if len(head) == 0:
 		raise _EndOfFile()
 
-	dct = orjson.loads(l)
-	return _dct_to_assgnm(dct)
-
-def _write_assgnm(file: BinaryIO, assgnm: AccessAssignment) -> None:
-	buf = orjson.dumps(_assgnm_to_dct(assgnm))
-	file.write(buf)
-	file.write(b'\n')
-
-def _assgnm_to_dct(assgnm: AccessAssignment) -> Dict[str, Any]:
-	return {
-		'access': {
-			'access_ts': assgnm.access.access_ts,
-			'file': assgnm.access.file,
-			'parts': assgnm.access.parts,
-		},
-		'cache_proc': assgnm.cache_proc,
-	}
+	length, = _frame_length.unpack(head)
+	return file.read(length + _frame_length.size)
+
+def _write_frame(buf: bytearray, record: bytes) -> None:
+	length = _frame_length.pack(len(record))
+	buf += length
+	buf += record
+	buf += length
+
+def _encode_assgnm(assgnm: AccessAssignment) -> bytes:
+	return b''.join((
+		_cache_proc.pack(assgnm.cache_proc),
+		_encode_access(assgnm.access),
+	))
+
+def _decode_assgnm(buf: bytes) -> AccessAssignment:
+	# Equivalent to _cache_proc followed by _decode_access(), decoded with a
+	# single struct call.
+	cache_proc, access_ts, file_length = _assgnm_head.unpack_from(buf, 0)
+	offset = _assgnm_head.size
+	file = buf[offset:offset + file_length].decode()
+	parts, _ = _decode_parts(buf, offset + file_length)
+	return AccessAssignment(Access(access_ts, file, parts), cache_proc)
+
+def _encode_access(access: Access) -> bytes:
+	file = access.file.encode()
+	return b''.join((
+		_access_head.pack(access.access_ts, len(file)),
+		file,
+		_encode_parts(access.parts),
+	))
+
+def _decode_access(buf: bytes, offset: int) -> Tuple[Access, int]:
+	access_ts, file_length = _access_head.unpack_from(buf, offset)
+	offset += _access_head.size
+	file = buf[offset:offset + file_length].decode()
+	parts, offset = _decode_parts(buf, offset + file_length)
+	return Access(access_ts, file, parts), offset
+
+def _parts_struct(n: int) -> struct.Struct:
+	"""Returns the Struct for a count followed by n parts.
+	"""
+	parts_struct = _parts_structs.get(n)
+	if parts_struct is None:
+		parts_struct = struct.Struct('<I' + 'IQ' * n)
+		_parts_structs[n] = parts_struct
+	return parts_struct
+
+_parts_structs: Dict[int, struct.Struct] = {}
+
+def _encode_parts(parts: Iterable[PartSpec]) -> bytes:
+	parts = list(parts)
+	return _parts_struct(len(parts)).pack(
+		len(parts),
+		*itertools.chain.from_iterable(parts),
+	)
+
+def _decode_parts(buf: bytes, offset: int) -> Tuple[List[PartSpec], int]:
+	n, = _count.unpack_from(buf, offset)
+	parts_struct = _parts_struct(n)
+	flat = parts_struct.unpack_from(buf, offset)
+	return list(zip(flat[1::2], flat[2::2])), offset + parts_struct.size
+
+def _encode_files(files: Iterable[FileID]) -> bytes:
+	encoded = [file.encode() for file in files]
+	return b''.join(itertools.chain(
+		(_count.pack(len(encoded)),),
+		itertools.chain.from_iterable(
+			(_file_length.pack(len(file)), file) for file in encoded
+		),
+	))
+
+def _decode_files(buf: bytes, offset: int) -> Tuple[List[FileID], int]:
+	n, = _count.unpack_from(buf, offset)
+	offset += _count.size
+	files: List[FileID] = []
+	for _ in range(n):
+		length, = _file_length.unpack_from(buf, offset)
+		offset += _file_length.size
+		files.append(buf[offset:offset + length].decode())
+		offset += length
+	return files, offset
+
+# JSON line of an assignment, equal to the orjson output for a dict of the
+# same structure. Formatting into a template avoids building nested dicts
+# for each record.
+_assgnm_json_line = b'{"access":{"access_ts":%d,"file":%b,"parts":%b},"cache_proc":%d}\n'
 
 def _dct_to_assgnm(dct: Dict[str, Any]) -> AccessAssignment:
 	access = dct['access']
@@ -202,17 +649,26 @@ def _dct_to_assgnm(dct: Dict[str, Any]) -> AccessAssignment:
 		Access(
 			access['access_ts'],
 			access['file'],
-			list(map(cast('Callable[[Any], Tuple[int, int]]', tuple), access['parts'])),
+			_parts_from_json(access['parts']),
 		),
 		dct['cache_proc'],
 	)
 
+def _parts_from_json(parts: List[List[int]]) -> List[PartSpec]:
+	# Unpacking in a comprehension is considerably faster than calling
+	# tuple() for each part.
+	return [(part_ind, size) for part_ind, size in parts]
+
 def replay_access_info(file: BinaryIO) -> Iterator[AccessInfo]:
-	file.seek(0, SEEK_SET)
+	read_access_info = _read_access_info
+	if _is_binary(file):
+		read_access_info = _read_access_info_bin
+	else:
+		file.seek(0, SEEK_SET)
 
 	while True:
 		try:
-			yield _read_access_info(file)
+			yield read_access_info(file)
 		except _EndOfFile:
 			break
 
@@ -221,20 +677,44 @@ def replay_access_info_path(path: _PathType) -> Iterator[AccessInfo]:
 		for assgnm in replay_access_info(file):
 			yield assgnm
 
-def record_access_info(file: BinaryIO, it: Iterable[AccessInfo]) -> None:
-	for access in it:
-		_write_access_info(file, access)
+def record_access_info(file: BinaryIO, it: Iterable[AccessInfo], binary: bool = False) -> None:
+	write_access_info = _write_access_info
+	buf = bytearray()
+	if binary:
+		buf += _BINARY_HEADER
+		write_access_info = _write_access_info_bin
 
-def record_access_info_path(path: _PathType, it: Iterable[AccessInfo]) -> None:
+	# Records are collected in buf and written to file in batches.
+	try:
+		for access in it:
+			write_access_info(buf, access)
+			if len(buf) >= _WRITE_BATCH_SIZE:
+				file.write(buf)
+				buf.clear()
+	finally:
+		file.write(buf)
+
+def record_access_info_path(path: _PathType, it: Iterable[AccessInfo], binary: bool = False) -> None:
 	with open(path, mode='wb') as file:
-		record_access_info(file, it)
+		record_access_info(file, it, binary=binary)
 
 def passthrough_record_access_info(
 	file: BinaryIO,
 	it: Iterable[AccessInfo],
+	binary: bool = False,
 ) -> Iterator[AccessInfo]:
+	write_access_info = _write_access_info
+	if binary:
+		file.write(_BINARY_HEADER)
+		write_access_info = _write_access_info_bin
+
+	# Each record is written before it is yielded, the caller may stop
+	# iterating (and close file) at any point.
+	buf = bytearray()
 	for access in it:
-		_write_access_info(file, access)
+		write_access_info(buf, access)
+		file.write(buf)
+		buf.clear()
 		yield access
 
 def _read_access_info(file: BinaryIO) -> AccessInfo:
@@ -245,27 +725,73 @@ def _read_access_info(file: BinaryIO) -> AccessInfo:
 	dct = orjson.loads(l)
 	return _dct_to_access_info(dct)
 
-def _write_access_info(file: BinaryIO, info: AccessInfo) -> None:
-	buf = orjson.dumps(_access_info_to_dct(info))
-	file.write(buf)
-	file.write(b'\n')
-
-def _access_info_to_dct(info: AccessInfo) -> Dict[str, Any]:
-	return {
-		'access': {
-			'access_ts': info.access.access_ts,
-			'file': info.access.file,
-			'parts': info.access.parts,
-		},
-		'hit_parts': info.hit_parts,
-		'file_hit': info.file_hit,
-		'bytes_hit': info.bytes_hit,
-		'bytes_missed': info.bytes_missed,
-		'bytes_added': info.bytes_added,
-		'bytes_removed': info.bytes_removed,
-		'total_bytes': info.total_bytes,
-		'evicted_files': info.evicted_files,
-	}
+def _write_access_info(buf: bytearray, info: AccessInfo) -> None:
+	access = info.access
+	buf += _access_info_json_line % (
+		access.access_ts,
+		orjson.dumps(access.file),
+		orjson.dumps(access.parts),
+		orjson.dumps(info.hit_parts),
+		b'true' if info.file_hit else b'false',
+		info.bytes_hit,
+		info.bytes_missed,
+		info.bytes_added,
+		info.bytes_removed,
+		info.total_bytes,
+		orjson.dumps(info.evicted_files),
+	)
+
+def _read_access_info_bin(file: BinaryIO) -> AccessInfo:
+	return _decode_access_info(_read_frame(file))
+
+def _write_access_info_bin(buf: bytearray, info: AccessInfo) -> None:
+	_write_frame(buf, _encode_access_info(info))
+
+def _encode_access_info(info: AccessInfo) -> bytes:
+	return b''.join((
+		_encode_access(info.access),
+		_encode_parts(info.hit_parts),
+		_access_info_stats.pack(
+			info.file_hit,
+			info.bytes_hit,
+			info.bytes_missed,
+			info.bytes_added,
+			info.bytes_removed,
+			info.total_bytes,
+		),
+		_encode_files(info.evicted_files),
+	))
+
+def _decode_access_info(buf: bytes) -> AccessInfo:
+	access, offset = _decode_access(buf, 0)
+	hit_parts, offset = _decode_parts(buf, offset)
+	(
+		file_hit,
+		bytes_hit,
+		bytes_missed,
+		bytes_added,
+		bytes_removed,
+		total_bytes,
+	) = _access_info_stats.unpack_from(buf, offset)
+	evicted_files, _ = _decode_files(buf, offset + _access_info_stats.size)
+	return AccessInfo(
+		access,
+		hit_parts,
+		file_hit,
+		bytes_hit,
+		bytes_missed,
+		bytes_added,
+		bytes_removed,
+		total_bytes,
+		evicted_files,
+	)
+
+# JSON line of an AccessInfo, see _assgnm_json_line.
+_access_info_json_line = (
+	b'{"access":{"access_ts":%d,"file":%b,"parts":%b},"hit_parts":%b,'
+	b'"file_hit":%b,"bytes_hit":%d,"bytes_missed":%d,"bytes_added":%d,'
+	b'"bytes_removed":%d,"total_bytes":%d,"evicted_files":%b}\n'
+)
 
 def _dct_to_access_info(dct: Dict[str, Any]) -> AccessInfo:
 	access = dct['access']
@@ -273,9 +799,9 @@ def _dct_to_access_info(dct: Dict[str, Any]) -> AccessInfo:
 		Access(
 			access['access_ts'],
 			access['file'],
-			list(map(cast('Callable[[Any], Tuple[int, int]]', tuple), access['parts'])),
+			_parts_from_json(access['parts']),
 		),
-		list(map(cast('Callable[[Any], Tuple[int, int]]', tuple), dct['hit_parts'])),
+		_parts_from_json(dct['hit_parts']),
 		dct['file_hit'],
 		dct['bytes_hit'],
 		dct['bytes_missed'],
@@ -286,25 +812,10 @@ def _dct_to_access_info(dct: Dict[str, Any]) -> AccessInfo:
 	)
 
 
-class _ForwardsCursor(object):
-	"""WIP: An advanced iterator over a file-backed access assignment sequence.
+def _forwards_cursor(file: BinaryIO, cache_proc: int) -> Iterator[Access]:
+	"""WIP: An iterator over the accesses of one cache processor in a file.
 	"""
-	def __init__(self, file: BinaryIO, cache_proc: int) -> None:
-		file.seek(0, SEEK_SET)
-		self._file: BinaryIO = file
-		self._cache_proc: int = cache_proc
-
-	def __iter__(self) -> Iterator[Access]:
-		return self
-
-	def __next__(self) -> Access:
-		while True:
-			try:
-				assgnm = _read_assgnm(self._file)
-				if assgnm.cache_proc == self._cache_proc:
-					return assgnm.access
-			except _EndOfFile:
-				raise StopIteration()
+	return filter_cache_processor(cache_proc, _replay(file))
 
 
 class Predicate(abc.ABC):
@@ -357,6 +868,16 @@ class Predicate(abc.ABC):
 		"""
 		raise NotImplementedError
 
+	def key_range(self) -> Tuple[Callable[[AccessAssignment], int], int, int]:
+		"""Returns (key, begin, end): the predicate holds iff begin <= key(assgnm) < end.
+
+		key must be non-decreasing along the assignment sequence, e.g. the
+		access time stamp. This method may be implemented optionally by
+		checkers of OneRange style. It allows the range to be located by
+		binary search over the file instead of replaying the sequence.
+		"""
+		raise NotImplementedError
+
 
 class Reader(object):
 	"""Represents a sequence of access assignments readable from a file.
@@ -399,7 +920,7 @@ class Reader(object):
 
 		def __len__(self) -> int:
 			if self._len is None:
-				l = sum(map(lambda _: 1, iter(self)))
+				l = sum(1 for _ in self)
 				self._len = l
 				return l
 			else:
@@ -474,7 +995,12 @@ class Reader(object):
 			if self._unevaluated_predicate:
 				self._evaluate_predicate()
 			else:
-				consume(iter(self))
+				with open(self._path, mode='rb') as file:
+					self._len = _count_records(
+						file,
+						begin_pos = self._begin_pos,
+						end_pos = self._end_pos,
+					)
 
 		return cast(int, self._len)
 
@@ -499,6 +1025,28 @@ class Reader(object):
 
 		# Only evaluates a Predicate of OneRange style with YieldOnly action.
 
+		try:
+			key, begin_key, end_key = p.key_range()
+		except NotImplementedError:
+			pass
+		else:
+			with open(self._path, mode='rb') as file:
+				if _is_binary(file):
+					# Frames can not be located from arbitrary positions, but
+					# hopping over them does not require decoding.
+					offsets = _frame_offsets(file)
+					begin_ind = _bisect_frames(file, offsets, key, begin_key)
+					end_ind = max(begin_ind, _bisect_frames(file, offsets, key, end_key))
+					self._begin_pos, self._end_pos = offsets[begin_ind], offsets[end_ind]
+					self._len = end_ind - begin_ind
+				else:
+					self._begin_pos = _bisect_lines(file, key, begin_key)
+					self._end_pos = max(self._begin_pos, _bisect_lines(file, key, end_key))
+					self._len = _count_records(file, begin_pos=self._begin_pos, end_pos=self._end_pos)
+
+			self._unevaluated_predicate = False
+			return
+
 		opt_replay_state: Optional[_ReplayStateAccessor] = None
 
 		def state_cb(state_accessor: _ReplayStateAccessor) -> None:
@@ -572,25 +1120,30 @@ class Reader(object):
 			end_pos = end
 
 		except NotImplementedError:
+			found = False
 			for assgnm in it:
 				if p(assgnm):
-					begin_pos = end
+					found = True
 					break
 
-				length += 1
 				read_state()
 
-			length += 1
-			read_state()
-
-			for assgnm in it:
-				if not p(assgnm):
-					end_pos = end
-					break
+			# end is the position after the last assignment not satisfying p
+			begin_pos = end
 
+			if found:
 				length += 1
 				read_state()
 
+				for assgnm in it:
+					if not p(assgnm):
+						break
+
+					length += 1
+					read_state()
+
+			end_pos = end
+
 		self._begin_pos = begin_pos
 		self._end_pos = end_pos
 		self._len = length
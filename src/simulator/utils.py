@@ -1,6 +1,7 @@
 import collections
 import itertools
 import operator
+import sys
 from typing import Any, Callable, cast, Iterable, Iterator, Optional, TypeVar
 
 _T = TypeVar('_T')
@@ -17,6 +18,10 @@ def callback_iterable(cb: Callable[[], None]) -> Iterator[Any]:
 def repeat_each(it: Iterable[_T], n: int) -> Iterator[_T]:
 	"""Returns an iterator which repeats each element of it n times.
 	"""
+	if n == 1:
+		return iter(it)
+	elif n <= 0:
+		return iter(())
 	return itertools.chain.from_iterable(itertools.repeat(el, n) for el in it)
 
 def consume(it: Iterable[Any], n: Optional[int]=None) -> None:
@@ -39,6 +44,9 @@ def accumulate(
 
 	This replicates the behaviour of itertools.accumulate in Python 3.8.
 	"""
+	if sys.version_info >= (3, 8):
+		return itertools.accumulate(iterable, func, initial=initial)
+
 	initial_it = [initial] if initial is not None else []
 
 	return itertools.accumulate(
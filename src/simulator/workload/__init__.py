@@ -37,6 +37,8 @@ class Job(object):
 
 
 class Submitter(abc.ABC):
+	__slots__ = ['start_ts', '_origin']
+
 	def __init__(self, start_ts: TimeStamp, origin: Optional[Any]=None) -> None:
 		self.start_ts: TimeStamp = start_ts
 		self._origin: Optional[Any] = origin
@@ -54,6 +56,8 @@ Task = Iterable[Submitter]
 
 
 class PartsGenerator(abc.ABC):
+	__slots__: List[str] = []
+
 	@abc.abstractmethod
 	def parts(self, total_bytes: int) -> List[PartSpec]:
 		raise NotImplementedError
@@ -1,8 +1,9 @@
-import json
-import jsonschema
+from functools import lru_cache
+from jsonschema.exceptions import best_match
+from jsonschema.validators import validator_for
+import orjson
 import pkg_resources
-import re
-from typing import Any, AnyStr, cast, Iterable, IO, Tuple
+from typing import Any, AnyStr, Callable, cast, Dict, Iterable, IO, List, Mapping, Optional, Tuple
 
 from . import BytesRate, BytesSize
 from .units import bytes_size_units
@@ -11,22 +12,42 @@ FieldPath = Iterable[str]
 FieldType = str
 TransformFieldSpec = Tuple[FieldPath, FieldType]
 
-_bytes_rate_re = re.compile('^(?P<number>\\d+(\\.\\d+)?) ((?P<prefix>[KMGTPEZY])?i)?B/s$')
-_bytes_size_re = re.compile('^(?P<number>\\d+(\\.\\d+)?) ((?P<prefix>[KMGTPEZY])?i)?B$')
+# Multipliers keyed by the unit suffix of bytes size and bytes rate
+# expressions. The prefix-less 'B' is accepted as well as 'iB'.
+_bytes_size_mults: Dict[str, int] = {'B': 1, **bytes_size_units}
+_bytes_rate_mults: Dict[str, int] = dict(
+	(unit + '/s', mult) for unit, mult in _bytes_size_mults.items()
+)
+
+def _parse_number_with_unit(s: str, mults: Mapping[str, int]) -> Optional[int]:
+	"""Parses expressions of the form '<digits>[.<digits>] <unit>'.
+
+	Returns None if s is not a valid expression.
+	"""
+	number, _, unit = s.partition(' ')
+	mult = mults.get(unit)
+	if mult is None:
+		return None
+
+	int_part, dot, frac_part = number.partition('.')
+	if not int_part.isdecimal() or (dot and not frac_part.isdecimal()):
+		return None
+
+	if not dot:
+		return int(int_part) * mult
+	return round(float(number) * mult)
 
 def parse_bytes_rate(s: str) -> BytesRate:
-	match = _bytes_rate_re.fullmatch(s)
-	if match is None:
+	value = _parse_number_with_unit(s, _bytes_rate_mults)
+	if value is None:
 		raise ValueError(f'Invalid bytes rate expression {s!r}')
-	prefix = match.group('prefix') if match.group('prefix') is not None else ''
-	return round(float(match.group('number')) * bytes_size_units[prefix + 'iB'])
+	return value
 
 def parse_bytes_size(s: str) -> BytesSize:
-	match = _bytes_size_re.fullmatch(s)
-	if match is None:
+	value = _parse_number_with_unit(s, _bytes_size_mults)
+	if value is None:
 		raise ValueError(f'Invalid bytes size expression {s!r}')
-	prefix = match.group('prefix') if match.group('prefix') is not None else ''
-	return round(float(match.group('number')) * bytes_size_units[prefix + 'iB'])
+	return value
 
 _transformers = {
 	'bytes_size': parse_bytes_size,
@@ -36,31 +57,51 @@ _transformers = {
 # Build the complete import path for the sub-package 'models'
 _models_package = '.'.join(__name__.split('.')[:-1] + ['models'])
 
+@lru_cache(maxsize=None)
+def _load_schema(schema_package: str, schema_file_name: str) -> Any:
+	with pkg_resources.resource_stream(schema_package, schema_file_name) as schema_file:
+		return orjson.loads(schema_file.read())
+
+@lru_cache(maxsize=None)
+def _load_validator(schema_package: str, schema_file_name: str) -> Any:
+	schema = _load_schema(schema_package, schema_file_name)
+	cls = validator_for(schema)
+	cls.check_schema(schema)
+	return cls(schema)
+
+# Sentinel for absent fields, None is a valid JSON value.
+_missing = object()
+
+@lru_cache(maxsize=32)
+def _compile_transformations(
+	transformations: Tuple[Tuple[Tuple[str, ...], FieldType], ...],
+) -> List[Tuple[Tuple[str, ...], str, Callable[[str], int]]]:
+	return [(path[:-1], path[-1], _transformers[typ]) for path, typ in transformations]
+
 def load_validate_transform(
 	params_file: IO[AnyStr],
 	schema_file_name: str,
 	transformations: Iterable[TransformFieldSpec] = [],
 	schema_package: str = _models_package,
 ) -> Any:
-	with pkg_resources.resource_stream(schema_package, schema_file_name) as schema_file:
-		schema = json.load(schema_file)
+	validator = _load_validator(schema_package, schema_file_name)
 
-	instance = json.load(params_file)
+	instance = orjson.loads(params_file.read())
 
-	jsonschema.validate(instance, schema)
+	# Same as jsonschema.validate, without re-checking the schema
+	error = best_match(validator.iter_errors(instance))
+	if error is not None:
+		raise error
 
-	for path, typ in transformations:
+	compiled = _compile_transformations(tuple((tuple(path), typ) for path, typ in transformations))
+	for parent_path, leaf_name, transformer in compiled:
 		el = instance
-		path_list = list(path)
-
-		try:
-			for item_name in path_list[:-1]:
-				el = el[item_name]
-
-			orig_value = el[path_list[-1]]
-		except KeyError:
-			continue
-
-		el[path_list[-1]] = _transformers[typ](orig_value)
+		for item_name in parent_path:
+			el = el.get(item_name, _missing) if isinstance(el, dict) else _missing
+			if el is _missing:
+				break
+		else:
+			if isinstance(el, dict) and leaf_name in el:
+				el[leaf_name] = transformer(el[leaf_name])
 
 	return instance
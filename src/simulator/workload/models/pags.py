@@ -1,17 +1,18 @@
-import functools
 import itertools
 import math
-from typing import AnyStr, cast, IO, Iterable, Iterator, List, Optional
+from typing import AnyStr, cast, IO, Iterator, List, Optional
 from typing_extensions import TypedDict
 from random import Random
 
-from .. import AccessRequest, BytesRate, BytesSize, Job, Submitter, TimeStamp
+from .. import AccessRequest, BytesRate, BytesSize, Job, PartsGenerator, Submitter, TimeStamp
 from ..jsonparams import load_validate_transform
 from ..nodes import (
 	ComputingNode,
 	delaying_channel,
 	DistributionSchedule,
+	EventChannel,
 	LinearGrowthModel,
+	lognormal_dist,
 	Node,
 	PassiveNode,
 	PhysicsProcessingModel,
@@ -19,11 +20,14 @@ from ..nodes import (
 )
 from ..schemes import NonCorrelatedSchemesGenerator
 from ..units import MiB, GiB, TiB, day
-from ...utils import repeat_each
 
 
 class SimpleNoiseNode(Node):
+	__slots__ = ['_file_size', '_files_per_directory', '_submit_rate']
+
 	class _Submitter(Submitter):
+		__slots__ = ['_node']
+
 		def __init__(self, node: 'SimpleNoiseNode') -> None:
 			super(SimpleNoiseNode._Submitter, self).__init__(0, origin=node)
 
@@ -31,30 +35,35 @@ class SimpleNoiseNode(Node):
 
 		def _files_generator(self) -> Iterator[str]:
 			base = f'{id(self)}/'
+			files_per_directory = self._node._files_per_directory
 
-			dir_it: Iterable[str] = itertools.repeat('')
-			if self._node._files_per_directory > 0:
-				dir_it = repeat_each(
-					(f'{i}/' for i in itertools.count()),
-					self._node._files_per_directory,
-				)
+			if files_per_directory <= 0:
+				yield from (base + str(i) for i in itertools.count())
+				return
 
-			return (
-				f'{base}{dir}{i}' for i, dir in enumerate(dir_it)
-			)
+			for dir in itertools.count():
+				prefix = f'{base}{dir}/'
+				first = dir * files_per_directory
+				for i in range(first, first + files_per_directory):
+					yield prefix + str(i)
 
 		def __iter__(self) -> Iterator[Job]:
 			submit_rate = self._node._submit_rate
 			read_size = self._node._file_size
-			parts = [(0, read_size)]
+			parts = ((0, read_size),)
+			job, access_request = Job, AccessRequest
 
-			total_submitted: int = 0
+			# ts is ceil(total_submitted / submit_rate), tracked as the whole
+			# seconds and the remainder of total_submitted to keep both bounded.
+			whole_ts: TimeStamp = 0
+			remainder: int = 0
 			ts: TimeStamp = 0
 			for file in self._files_generator():
-				yield Job(ts, [AccessRequest(file, parts)])
+				yield job(ts, (access_request(file, parts),))
 
-				total_submitted += read_size # TODO is this safe (ever growing)?
-				ts = math.ceil(total_submitted / submit_rate)
+				delta_ts, remainder = divmod(remainder + read_size, submit_rate)
+				whole_ts += delta_ts
+				ts = whole_ts + 1 if remainder > 0 else whole_ts
 
 
 	def __init__(
@@ -198,13 +207,63 @@ c_0_params: Spec.Params = {
 	},
 }
 
+def _skim_node(
+	params: Spec.Params,
+	random: Random,
+	parent: PassiveNode,
+	channel: EventChannel,
+	parts_generator: PartsGenerator,
+	i: int,
+) -> ComputingNode:
+	return ComputingNode(
+		delaying_channel( # trigger
+			channel, # channel
+			lognormal_dist( # delay_distribution_dist
+				random,
+				params['skim']['delay_schedule']['lognormal_distribution']['mu'],
+				params['skim']['delay_schedule']['lognormal_distribution']['sigma'],
+			),
+		),
+		parent.data_set, # input_data_set
+		PhysicsProcessingModel( # processing_model
+			parts_generator, # parts_generator
+			params['skim']['job_read_size'],
+			params['skim']['output_fraction'],
+			params['skim']['file_size'],
+		),
+		name = f'skimming task #{i}',
+	)
+
+def _ana_node(
+	params: Spec.Params,
+	random: Random,
+	parent: Node,
+	parts_generator: PartsGenerator,
+	i: int,
+) -> ComputingNode:
+	return ComputingNode(
+		skipping_channel( # trigger
+			DistributionSchedule.from_rand_variate( # channel
+				random.normalvariate, # dist function
+				params['ana']['schedule']['normal_distribution']['mu'],
+				params['ana']['schedule']['normal_distribution']['sigma'],
+			),
+		),
+		parent.data_set, # input_data_set
+		PhysicsProcessingModel( # processing_model
+			parts_generator, # parts_generator
+			params['ana']['job_read_size'],
+			params['ana']['output_fraction'],
+			params['ana']['file_size'],
+		),
+		name = f'analysis task #{i}',
+	)
+
 def build(params: Spec.Params, seed: Optional[int]=None) -> List[Node]:
 	random = Random(seed)
 
 	nodes: List[Node] = []
 	grid_layer: List[PassiveNode] = []
-	skim_layer: List[Node] = []
-	ana_layer: List[Node] = []
 
 	root_node = PassiveNode(
 		LinearGrowthModel(
@@ -225,61 +284,38 @@ def build(params: Spec.Params, seed: Optional[int]=None) -> List[Node]:
 
 	nodes.extend(grid_layer)
 
-	for skim_parent in grid_layer:
-		channels = itertools.tee(skim_parent.update_channel(), params['skim']['node_spread'])
-		schemes_generator = NonCorrelatedSchemesGenerator(
-			params['skim']['node_spread'],
-			params['skim']['read_fraction'],
+	# The parts generators are stateless and shared by the children of all parents
+	skim_schemes_generator = NonCorrelatedSchemesGenerator(
+		params['skim']['node_spread'],
+		params['skim']['read_fraction'],
+	)
+	skim_parts_generators = [
+		skim_schemes_generator.with_index(i) for i in range(params['skim']['node_spread'])
+	]
+
+	skim_layer: List[Node] = [
+		_skim_node(params, random, skim_parent, channel, skim_parts_generators[i], i)
+		for skim_parent in grid_layer
+		for i, channel in enumerate(
+			itertools.tee(skim_parent.update_channel(), params['skim']['node_spread']),
 		)
-
-		for i, channel in enumerate(channels):
-			node = ComputingNode(
-				delaying_channel( # trigger
-					channel, # channel
-					functools.partial( # delay_distribution_dist
-						random.lognormvariate, # dist function
-						params['skim']['delay_schedule']['lognormal_distribution']['mu'],
-						params['skim']['delay_schedule']['lognormal_distribution']['sigma'],
-					),
-				),
-				skim_parent.data_set, # input_data_set
-				PhysicsProcessingModel( # processing_model
-					schemes_generator.with_index(i), # parts_generator
-					params['skim']['job_read_size'],
-					params['skim']['output_fraction'],
-					params['skim']['file_size'],
-				),
-				name = f'skimming task #{i}',
-			)
-			skim_layer.append(node)
+	]
 
 	nodes.extend(skim_layer)
 
-	for ana_parent in skim_layer:
-		schemes_generator = NonCorrelatedSchemesGenerator(
-			params['ana']['node_spread'],
-			params['ana']['read_fraction'],
-		)
-
-		for i in range(params['ana']['node_spread']):
-			node = ComputingNode(
-				skipping_channel( # trigger
-					DistributionSchedule.from_rand_variate( # channel
-						random.normalvariate, # dist function
-						params['ana']['schedule']['normal_distribution']['mu'],
-						params['ana']['schedule']['normal_distribution']['sigma'],
-					),
-				),
-				ana_parent.data_set, # input_data_set
-				PhysicsProcessingModel( # processing_model
-					schemes_generator.with_index(i), # parts_generator
-					params['ana']['job_read_size'],
-					params['ana']['output_fraction'],
-					params['ana']['file_size'],
-				),
-				name = f'analysis task #{i}',
-			)
-			ana_layer.append(node)
+	ana_schemes_generator = NonCorrelatedSchemesGenerator(
+		params['ana']['node_spread'],
+		params['ana']['read_fraction'],
+	)
+	ana_parts_generators = [
+		ana_schemes_generator.with_index(i) for i in range(params['ana']['node_spread'])
+	]
+
+	ana_layer: List[Node] = [
+		_ana_node(params, random, ana_parent, ana_parts_generators[i], i)
+		for ana_parent in skim_layer
+		for i in range(params['ana']['node_spread'])
+	]
 
 	nodes.extend(ana_layer)
 
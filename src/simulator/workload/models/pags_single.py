@@ -2,7 +2,7 @@ from typing import AnyStr, cast, IO, List, Optional
 from typing_extensions import TypedDict
 from random import Random
 
-from .. import BytesRate, BytesSize
+from .. import BytesRate, BytesSize, PartsGenerator
 from ..jsonparams import load_validate_transform
 from ..nodes import (
 	ComputingNode,
@@ -82,12 +82,36 @@ example_params: Spec.Params = {
 	},
 }
 
+def _computing_node(
+	params: Spec.Params,
+	random: Random,
+	parent: PassiveNode,
+	parts_generator: PartsGenerator,
+	i: int,
+) -> ComputingNode:
+	return ComputingNode(
+		skipping_channel( # trigger
+			DistributionSchedule.from_rand_variate( # channel
+				random.normalvariate, # dist function
+				params['computing']['schedule']['normal_distribution']['mu'],
+				params['computing']['schedule']['normal_distribution']['sigma'],
+			),
+		),
+		parent.data_set, # input_data_set
+		PhysicsProcessingModel( # processing_model
+			parts_generator, # parts_generator
+			params['computing']['job_read_size'],
+			0.0, # output_fraction
+			1, # file_size
+		),
+		name = f'computing task #{i}',
+	)
+
 def build(params: Spec.Params, seed: Optional[int]=None) -> List[Node]:
 	random = Random(seed)
 
 	nodes: List[Node] = []
 	root_layer: List[PassiveNode] = []
-	children_layer: List[Node] = []
 
 	root_node = PassiveNode(
 		ReplaceModel(
@@ -105,31 +129,20 @@ def build(params: Spec.Params, seed: Optional[int]=None) -> List[Node]:
 	root_layer.append(root_node)
 	nodes.extend(root_layer)
 
-	for parent in root_layer:
-		schemes_generator = NonCorrelatedSchemesGenerator(
-			params['computing']['node_spread'],
-			params['computing']['read_fraction'],
-		)
-
-		for i in range(params['computing']['node_spread']):
-			node = ComputingNode(
-				skipping_channel( # trigger
-					DistributionSchedule.from_rand_variate( # channel
-						random.normalvariate, # dist function
-						params['computing']['schedule']['normal_distribution']['mu'],
-						params['computing']['schedule']['normal_distribution']['sigma'],
-					),
-				),
-				parent.data_set, # input_data_set
-				PhysicsProcessingModel( # processing_model
-					schemes_generator.with_index(i), # parts_generator
-					params['computing']['job_read_size'],
-					0.0, # output_fraction
-					1, # file_size
-				),
-				name = f'computing task #{i}',
-			)
-			children_layer.append(node)
+	# The parts generators are stateless and shared by the children of all parents
+	schemes_generator = NonCorrelatedSchemesGenerator(
+		params['computing']['node_spread'],
+		params['computing']['read_fraction'],
+	)
+	parts_generators = [
+		schemes_generator.with_index(i) for i in range(params['computing']['node_spread'])
+	]
+
+	children_layer: List[Node] = [
+		_computing_node(params, random, parent, parts_generators[i], i)
+		for parent in root_layer
+		for i in range(params['computing']['node_spread'])
+	]
 
 	nodes.extend(children_layer)
 
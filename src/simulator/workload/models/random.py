@@ -1,6 +1,4 @@
-import itertools
-import math
-from typing import AnyStr, cast, IO, Iterator, List, Optional, Tuple
+from typing import AnyStr, cast, Dict, IO, Iterator, List, Optional, Tuple
 from typing_extensions import TypedDict
 from random import Random
 
@@ -8,7 +6,6 @@ from .. import (
 	AccessRequest,
 	BytesRate,
 	BytesSize,
-	FileID,
 	Job,
 	PartsGenerator,
 	PartSpec,
@@ -23,7 +20,11 @@ from ..units import MiB, GiB, TiB
 
 
 class RandomNode(Node):
+	__slots__ = ['_input_data_set', '_submit_rate', '_parts_generator', '_random', '_schemes']
+
 	class _Submitter(Submitter):
+		__slots__ = ['_node']
+
 		def __init__(self, node: 'RandomNode') -> None:
 			super(RandomNode._Submitter, self).__init__(0, origin=node)
 
@@ -32,31 +33,32 @@ class RandomNode(Node):
 		def __iter__(self) -> Iterator[Job]:
 			data_set = self._node._input_data_set
 			submit_rate = self._node._submit_rate
+			scheme = self._node._scheme
+			choice = self._node._random.choice
+			job, access_request = Job, AccessRequest
+			# The list is only ever mutated in place by the DataSet
+			file_list = data_set.file_list
 
 			cached_file_size = data_set.file_size
-			cached_parts = self._node._parts_generator.parts(cached_file_size)
-			cached_bytes_accessed = sum(byte_count for _, byte_count in cached_parts)
+			cached_parts, cached_bytes_accessed = scheme(cached_file_size)
 
-			def create_access_scheme(file: FileID) -> Tuple[AccessRequest, BytesSize]:
-				nonlocal data_set, cached_file_size, cached_bytes_accessed, cached_parts
+			# ts is ceil(total_submitted / submit_rate), tracked as the whole
+			# seconds and the remainder of total_submitted to keep both bounded.
+			whole_ts: TimeStamp = 0
+			remainder: float = 0
+			ts: TimeStamp = 0
+			while True:
+				file = choice(file_list)
 
 				if data_set.file_size != cached_file_size:
 					cached_file_size = data_set.file_size
-					cached_parts = self._node._parts_generator.parts(cached_file_size)
-					cached_bytes_accessed = sum(byte_count for _, byte_count in cached_parts)
-				return AccessRequest(file, cached_parts), cached_bytes_accessed
-
-			total_submitted: int = 0
-			ts: TimeStamp = 0
-			for _ in itertools.repeat(None):
-				file = self._node._random.choice(data_set.file_list)
-
-				access_scheme, bytes_submitted = create_access_scheme(file)
+					cached_parts, cached_bytes_accessed = scheme(cached_file_size)
 
-				yield Job(ts, [access_scheme])
+				yield job(ts, (access_request(file, cached_parts),))
 
-				total_submitted += bytes_submitted # TODO is this safe (ever growing)?
-				ts = math.ceil(total_submitted / submit_rate)
+				delta_ts, remainder = divmod(remainder + cached_bytes_accessed, submit_rate)
+				whole_ts += int(delta_ts)
+				ts = whole_ts + 1 if remainder > 0 else whole_ts
 
 
 	def __init__(
@@ -74,9 +76,21 @@ class RandomNode(Node):
 		self._parts_generator: PartsGenerator = parts_generator
 		self._random: Random = random
 
+		# Parts and number of bytes accessed, by file size
+		self._schemes: Dict[BytesSize, Tuple[Tuple[PartSpec, ...], BytesSize]] = {}
+
 	def __iter__(self) -> Iterator[Submitter]:
 		yield RandomNode._Submitter(self)
 
+	def _scheme(self, file_size: BytesSize) -> Tuple[Tuple[PartSpec, ...], BytesSize]:
+		scheme = self._schemes.get(file_size)
+		if scheme is None:
+			# Shared by all jobs accessing files of this size, hence immutable
+			parts = tuple(self._parts_generator.parts(file_size))
+			scheme = parts, sum(byte_count for _, byte_count in parts)
+			self._schemes[file_size] = scheme
+		return scheme
+
 
 class Spec(object):
 	class DataSet(TypedDict):
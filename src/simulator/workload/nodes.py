@@ -2,8 +2,9 @@ import abc
 from enum import auto, Enum
 import itertools
 import functools
+import math
 import random
-from typing import Any, Callable, cast, Iterable, Iterator, Generic, Optional, Tuple, TypeVar
+from typing import Any, Callable, cast, Dict, Iterable, Iterator, Generic, Optional, Tuple, TypeVar
 from typing_extensions import Protocol
 
 from . import PartsGenerator, Submitter, TimeStamp
@@ -25,6 +26,11 @@ zero_dist: Distribution = lambda: 0.0
 def const_dist(c: float) -> Distribution:
 	return lambda: c
 
+def lognormal_dist(rng: random.Random, mu: float, sigma: float) -> Distribution:
+	"""Same variates as functools.partial(rng.lognormvariate, mu, sigma)."""
+	exp, normalvariate = math.exp, rng.normalvariate
+	return lambda: exp(normalvariate(mu, sigma))
+
 EventChannel = Iterable[TimeStamp]
 
 def delaying_channel(
@@ -76,6 +82,8 @@ class ProcessingModel(Protocol):
 
 
 class Node(abc.ABC):
+	__slots__ = ['_data_set', '_name']
+
 	_data_set: DataSet
 	_name: Optional[str]
 
@@ -103,14 +111,17 @@ class Node(abc.ABC):
 
 
 class DistributionSchedule(object):
+	__slots__ = ['_dist', '_yield_zero']
+
 	def __init__(self, dist: Distribution, yield_zero: bool=True):
 		self._dist = dist
 		self._yield_zero: bool = yield_zero
 
 	def __iter__(self) -> Iterator[TimeStamp]:
-		dist = self._dist
+		# iter(callable, sentinel) calls dist from C until it returns the
+		# sentinel, which a Distribution never does.
 		return accumulate(
-			map(int, map(lambda _: dist(), itertools.repeat(None))),
+			map(int, iter(self._dist, None)),
 			initial = 0 if self._yield_zero else None,
 		)
 
@@ -126,6 +137,8 @@ class DistributionSchedule(object):
 
 
 class LinearGrowthModel(object):
+	__slots__ = ['_initial_size', '_schedule', '_growth_rate', '_max_size']
+
 	def __init__(
 		self,
 		initial_size: int,
@@ -153,6 +166,8 @@ class LinearGrowthModel(object):
 
 
 class ReplaceModel(object):
+	__slots__ = ['_size', '_schedule']
+
 	def __init__(
 		self,
 		size: int,
@@ -195,27 +210,33 @@ class PassiveNode(Node):
 		"""
 		return (ts for ts, _, _ in self._update_dse_model)
 
-	def _crt_update_data_set_cb(self, action: DataSetAction, total_size: int) -> Callable[[], None]:
-		def inner() -> None:
-			if action is DataSetAction.GROW_SHRINK:
-				if total_size < self._data_set.size:
-					# TODO is shrinking necessary? Would require an ordering of files
-					# could be arbitrary, random or (reverse) creation order
-					self._data_set.replace(size=total_size)
-				else:
-					self._data_set.grow(total_size - self._data_set.size)
-			elif action is DataSetAction.REPLACE:
-				self._data_set.replace(size=total_size)
-			else:
-				raise NotImplementedError(f'Action {action!r} not supported by PassiveNode')
+	def _grow_or_shrink_data_set(self, total_size: int) -> None:
+		if total_size < self._data_set.size:
+			# TODO is shrinking necessary? Would require an ordering of files
+			# could be arbitrary, random or (reverse) creation order
+			self._data_set.replace(size=total_size)
+		else:
+			self._data_set.grow(total_size - self._data_set.size)
 
-		return inner
+	def _replace_data_set(self, total_size: int) -> None:
+		self._data_set.replace(size=total_size)
+
+	_data_set_updates: Dict[DataSetAction, Callable[['PassiveNode', int], None]] = {
+		DataSetAction.GROW_SHRINK: _grow_or_shrink_data_set,
+		DataSetAction.REPLACE: _replace_data_set,
+	}
 
 	def __iter__(self) -> Iterator[Submitter]:
+		data_set_updates = self._data_set_updates
 		for ts, action, size in self._iter_dse_model:
+			try:
+				update_data_set = data_set_updates[action]
+			except KeyError:
+				raise NotImplementedError(f'Action {action!r} not supported by PassiveNode') from None
+
 			yield CallbackWrapSubmitter(
 				NoneSubmitter(ts, origin=self),
-				post_cb = self._crt_update_data_set_cb(action, size),
+				post_cb = functools.partial(update_data_set, self, size),
 			)
 
 
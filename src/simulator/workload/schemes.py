@@ -1,14 +1,45 @@
-from typing import List
+import sys
+from typing import Iterator, List, Tuple
 
 from . import AccessRequest, FileID, PartSpec, PartsGenerator
 
+if sys.version_info >= (3, 10):
+	def _popcount(x: int) -> int:
+		return x.bit_count()
+else:
+	def _popcount(x: int) -> int:
+		return bin(x).count('1')
+
 
 class NonCorrelatedSchemesGenerator(object):
+	__slots__ = ['_number', '_fraction', '_parts_number', '_weight_tables']
+
 	def __init__(self, number: int, fraction: float) -> None:
 		self._number: int = number
 		self._fraction: float = fraction
 		self._parts_number: int = 2 ** number
 
+		# Share of the file's bytes in a part, by the number of schemes containing the part
+		weights = [
+			fraction ** containing_schemes * (1 - fraction) ** (number - containing_schemes)
+			for containing_schemes in range(number + 1)
+		]
+		# (part_index, weight) pairs of the parts of each scheme, by scheme index
+		self._weight_tables: List[List[Tuple[int, float]]] = [
+			[
+				(part_index, weights[_popcount(part_index)])
+				for part_index in self._scheme_part_indices(index)
+			]
+			for index in range(number)
+		]
+
+	def _scheme_part_indices(self, index: int) -> Iterator[int]:
+		# Insert 1 bit at index into binary representation of i
+		low_mask = (1 << index) - 1
+		bit = 1 << index
+		for i in range(2 ** (self._number - 1)):
+			yield ((i & ~low_mask) << 1) | bit | (i & low_mask)
+
 	@property
 	def number(self) -> int:
 		return self._number
@@ -18,36 +49,27 @@ class NonCorrelatedSchemesGenerator(object):
 		return self._fraction
 
 	def parts(self, index: int, total_bytes: int) -> List[PartSpec]:
-		scheme_parts_number = 2 ** (self._number - 1)
-
-		parts: List[PartSpec] = []
-
-		for i in range(scheme_parts_number):
-
-			# Insert 1 bit at index into binary representation of i
-			part_index = (((i << 1 >> index) | 1) << index) | (i & ((1 << index) - 1))
-
-			containing_schemes = bin(part_index).count('1')
-			part_bytes = round(total_bytes * (
-					self._fraction ** containing_schemes
-						*
-					(1 - self._fraction) ** (self._number - containing_schemes)
-			))
-
-			parts.append((part_index, part_bytes))
-
-		return parts
+		return [
+			(part_index, round(total_bytes * weight))
+			for part_index, weight in self._weight_tables[index]
+		]
 
 	def access_request(self, index: int, file: FileID, total_bytes: int) -> AccessRequest:
 		return AccessRequest(file, self.parts(index, total_bytes))
 
 	class WithIndex(PartsGenerator):
+		__slots__ = ['_generator', '_index', '_weight_table']
+
 		def __init__(self, generator: 'NonCorrelatedSchemesGenerator', index: int) -> None:
 			self._generator: NonCorrelatedSchemesGenerator = generator
 			self._index: int = index
+			self._weight_table: List[Tuple[int, float]] = generator._weight_tables[index]
 
 		def parts(self, total_bytes: int) -> List[PartSpec]:
-			return self._generator.parts(self._index, total_bytes)
+			return [
+				(part_index, round(total_bytes * weight))
+				for part_index, weight in self._weight_table
+			]
 
 		def access_request(self, file: FileID, total_bytes: int) -> AccessRequest:
 			return self._generator.access_request(self._index, file, total_bytes)
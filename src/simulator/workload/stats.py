@@ -1,4 +1,4 @@
-from typing import Dict, Iterable, Iterator, List, ValuesView
+from typing import Dict, Iterable, Iterator, ValuesView
 
 from . import Access, BytesSize, FileID, PartInd, TimeStamp
 
@@ -34,7 +34,7 @@ class FileStats(object):
 		self.accesses: int = 0
 		self.total_bytes_accessed: BytesSize = 0
 		self.unique_bytes_accessed: BytesSize = 0
-		self.parts: List[PartStats] = []
+		self.parts: Dict[PartInd, PartStats] = {}
 		self.first_access_time: TimeStamp = 0
 		self.last_access_time: TimeStamp = 0
 
@@ -42,7 +42,7 @@ class FileStats(object):
 		self.accesses = 0
 		self.total_bytes_accessed = 0
 		self.unique_bytes_accessed = 0
-		self.parts = []
+		self.parts = {}
 		self.first_access_time = 0
 		self.last_access_time = 0
 
@@ -88,39 +88,43 @@ class StatsCounters(object):
 		return PartStats(ind)
 
 	def process_access(self, access: Access) -> None:
+		file = access.file
 		try:
-			file_stats = self._files_stats[access.file]
+			file_stats = self._files_stats[file]
 		except KeyError:
-			file_stats = self._new_file_stats(access.file)
-			self._files_stats[access.file] = file_stats
+			file_stats = self._new_file_stats(file)
+			self._files_stats[file] = file_stats
 			file_stats.first_access_time = access.access_ts
 
 		file_stats.last_access_time = access.access_ts
 
-		file_stats.accesses += 1
-		self._total_stats.accesses += 1
-
+		parts_stats = file_stats.parts
+		total_bytes_read = 0
+		unique_bytes_read = 0
 		for ind, bytes_read in access.parts:
 			try:
-				part_stats = file_stats.parts[ind]
-			except IndexError:
-				l = len(file_stats.parts)
-				file_stats.parts.extend(
-					self._new_part_stats(l + i) for i in range(ind + 1 - l)
-				)
-				part_stats = file_stats.parts[ind]
+				part_stats = parts_stats[ind]
+			except KeyError:
+				part_stats = self._new_part_stats(ind)
+				parts_stats[ind] = part_stats
 
 			part_stats.accesses += 1
 
 			if bytes_read > part_stats.unique_bytes_accessed:
-				diff = bytes_read - part_stats.unique_bytes_accessed
-				part_stats.unique_bytes_accessed += diff
-				file_stats.unique_bytes_accessed += diff
-				self._total_stats.unique_bytes_accessed += diff
+				unique_bytes_read += bytes_read - part_stats.unique_bytes_accessed
+				part_stats.unique_bytes_accessed = bytes_read
 
 			part_stats.total_bytes_accessed += bytes_read
-			file_stats.total_bytes_accessed += bytes_read
-			self._total_stats.total_bytes_accessed += bytes_read
+			total_bytes_read += bytes_read
+
+		file_stats.accesses += 1
+		file_stats.unique_bytes_accessed += unique_bytes_read
+		file_stats.total_bytes_accessed += total_bytes_read
+
+		total_stats = self._total_stats
+		total_stats.accesses += 1
+		total_stats.unique_bytes_accessed += unique_bytes_read
+		total_stats.total_bytes_accessed += total_bytes_read
 
 
 class StatsCollector(object):
@@ -1,19 +1,21 @@
-import itertools
-from typing import Any, Callable, Iterator, Optional
+from typing import Any, Callable, Iterator, List, Optional
 
 from . import Job, Submitter, TimeStamp
-from ..utils import callback_iterable
 
 
 class NoneSubmitter(Submitter):
+	__slots__: List[str] = []
+
 	def __init__(self, start_ts: TimeStamp, origin: Optional[Any]=None) -> None:
 		super(NoneSubmitter, self).__init__(start_ts, origin=origin)
 
 	def __iter__(self) -> Iterator[Job]:
-		return iter([])
+		return iter(())
 
 
 class CallbackWrapSubmitter(Submitter):
+	__slots__ = ['_submitter', '_pre_cb', '_post_cb']
+
 	def __init__(
 		self,
 		submitter: Submitter,
@@ -26,11 +28,9 @@ class CallbackWrapSubmitter(Submitter):
 		self._post_cb: Callable[[], None] = post_cb
 
 	def __iter__(self) -> Iterator[Job]:
-		return itertools.chain(
-			callback_iterable(self._pre_cb),
-			iter(self._submitter),
-			callback_iterable(self._post_cb),
-		)
+		self._pre_cb()
+		yield from self._submitter
+		self._post_cb()
 
 	def __repr__(self) -> str:
 		return f'<CallbackWrapSubmitter wrapping {self._submitter!r}>'
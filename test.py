@@ -1,6 +1,6 @@
 from simulator.workload.physicsgroups.builder import build_physics_groups
 from simulator.distributor.scheduler import NodeSpec
-from simulator.distributor import Distributor
+from simulator.distributor import AccessAssignment, Distributor
 
 from simulator import recorder
 
@@ -15,8 +15,11 @@ from simulator.cache.algorithms.rand import Rand
 from simulator.cache.algorithms.landlord import Landlord, Mode
 from simulator.cache.algorithms.min import MIN
 
+from simulator.utils import consume
+
 import argparse
-import collections
+import contextlib
+import gc
 import itertools
 import sys
 
@@ -30,45 +33,66 @@ def for_each(f: Callable[[T], None], it: Iterable[T]) -> Iterator[T]:
 		it,
 	)
 
+def take_before(it: Iterable[AccessAssignment], time: int) -> Iterator[AccessAssignment]:
+	for assgnm in it:
+		if assgnm.access.access_ts >= time:
+			return
+		yield assgnm
+
+@contextlib.contextmanager
+def gc_paused() -> Iterator[None]:
+	"""Disables the cyclic garbage collector while draining the simulation.
+
+	The drains allocate millions of short-lived objects, triggering many
+	collections which each traverse all tracked objects.
+	"""
+	gc.disable()
+	try:
+		yield
+	finally:
+		gc.enable()
+		gc.collect()
+
 def print_access_stats(stats: StatsCollector, prefix: str="") -> None:
 	if len(prefix) > 0 and len(prefix.rstrip()) == len(prefix):
 		prefix += " "
 
-	print(prefix + "accesses", stats._total_stats.accesses)
-	print(prefix + "files", len(stats._files_stats))
-	print(prefix + "total_bytes_accessed", stats._total_stats.total_bytes_accessed)
-	print(prefix + "unique_bytes_accessed", stats._total_stats.unique_bytes_accessed)
-
-	print("")
-
-	print(prefix + "avg accesses per byte", stats._total_stats.total_bytes_accessed / stats._total_stats.unique_bytes_accessed)
-	print(prefix + "theoretical best byte miss rate", (stats._total_stats.unique_bytes_accessed) / stats._total_stats.total_bytes_accessed)
-	print(prefix + "theoretical best byte hit rate", (stats._total_stats.total_bytes_accessed - stats._total_stats.unique_bytes_accessed) / stats._total_stats.total_bytes_accessed)
+	total = stats._total_stats
+
+	sys.stdout.write(
+		f"{prefix}accesses {total.accesses}\n"
+		f"{prefix}files {len(stats._files_stats)}\n"
+		f"{prefix}total_bytes_accessed {total.total_bytes_accessed}\n"
+		f"{prefix}unique_bytes_accessed {total.unique_bytes_accessed}\n"
+		"\n"
+		f"{prefix}avg accesses per byte {total.total_bytes_accessed / total.unique_bytes_accessed}\n"
+		f"{prefix}theoretical best byte miss rate {total.unique_bytes_accessed / total.total_bytes_accessed}\n"
+		f"{prefix}theoretical best byte hit rate {(total.total_bytes_accessed - total.unique_bytes_accessed) / total.total_bytes_accessed}\n"
+	)
 
 def print_cache_stats(stats: CacheStatsCollector, prefix: str="") -> None:
 	if len(prefix) > 0 and len(prefix.rstrip()) == len(prefix):
 		prefix += " "
 
-	print(prefix + "accesses", stats._total_stats.accesses)
-	print(prefix + "files", len(stats._files_stats))
-	print(prefix + "total_bytes_accessed", stats._total_stats.total_bytes_accessed)
-	print(prefix + "unique_bytes_accessed", stats._total_stats.unique_bytes_accessed)
-	print(prefix + "bytes_hit", stats._total_stats.bytes_hit)
-	print(prefix + "bytes_missed", stats._total_stats.bytes_missed)
-	print(prefix + "bytes_added", stats._total_stats.bytes_added)
-	print(prefix + "bytes_removed", stats._total_stats.bytes_removed)
-
-	print("")
-
-	print(prefix + "avg accesses per byte", stats._total_stats.total_bytes_accessed / stats._total_stats.unique_bytes_accessed)
-	print(prefix + "theoretical best byte miss rate", (stats._total_stats.unique_bytes_accessed) / stats._total_stats.total_bytes_accessed)
-	print(prefix + "theoretical best byte hit rate", (stats._total_stats.total_bytes_accessed - stats._total_stats.unique_bytes_accessed) / stats._total_stats.total_bytes_accessed)
-
-	print("")
-
-	print(prefix + "byte miss rate", stats._total_stats.bytes_missed / stats._total_stats.total_bytes_accessed)
-	print(prefix + "byte hit rate", stats._total_stats.bytes_hit / stats._total_stats.total_bytes_accessed)
-
+	total = stats._total_stats
+
+	sys.stdout.write(
+		f"{prefix}accesses {total.accesses}\n"
+		f"{prefix}files {len(stats._files_stats)}\n"
+		f"{prefix}total_bytes_accessed {total.total_bytes_accessed}\n"
+		f"{prefix}unique_bytes_accessed {total.unique_bytes_accessed}\n"
+		f"{prefix}bytes_hit {total.bytes_hit}\n"
+		f"{prefix}bytes_missed {total.bytes_missed}\n"
+		f"{prefix}bytes_added {total.bytes_added}\n"
+		f"{prefix}bytes_removed {total.bytes_removed}\n"
+		"\n"
+		f"{prefix}avg accesses per byte {total.total_bytes_accessed / total.unique_bytes_accessed}\n"
+		f"{prefix}theoretical best byte miss rate {total.unique_bytes_accessed / total.total_bytes_accessed}\n"
+		f"{prefix}theoretical best byte hit rate {(total.total_bytes_accessed - total.unique_bytes_accessed) / total.total_bytes_accessed}\n"
+		"\n"
+		f"{prefix}byte miss rate {total.byte_miss_rate}\n"
+		f"{prefix}byte hit rate {total.byte_hit_rate}\n"
+	)
 
 def full_manual() -> None:
 	tasks = build_physics_groups()
@@ -81,9 +105,9 @@ def full_manual() -> None:
 	generate_time = 24 * 60 * 60
 	# generate_time = (2 * 365 * 24 * 60 * 60) + (30 * 24 * 60 * 60)
 	access_it = distributor
-	access_it = itertools.takewhile(lambda assgnm: assgnm.access.access_ts < generate_time, access_it)
+	access_it = take_before(access_it, generate_time)
 
-	with open("test.json", "w") as f:
+	with open("test.json", "wb") as f:
 		assignment_it = recorder.passthrough_record(f, access_it)
 
 		storage = Storage(500 * 2 ** (10 * 3))
@@ -92,7 +116,8 @@ def full_manual() -> None:
 
 		cache_sys = OnlineCacheSystem(processors, assignment_it)
 
-		collections.deque(cache_sys, maxlen=0)
+		with gc_paused():
+			consume(cache_sys)
 
 	print_access_stats(distributor.stats, prefix="[dist]")
 
@@ -113,10 +138,9 @@ def record_manual() -> None:
 	# generate_time = (2 * 365 * 24 * 60 * 60) + (30 * 24 * 60 * 60)
 	generate_time = 30 * 24 * 60 * 60
 	access_it = distributor
-	access_it = itertools.takewhile(lambda assgnm: assgnm.access.access_ts < generate_time, access_it)
+	access_it = take_before(access_it, generate_time)
 
-	with open("min_test.json", "w") as f:
-		recorder.record(f, access_it)
+	recorder.record_path("min_test.json", access_it)
 
 	print_access_stats(distributor.stats, prefix="[dist]")
 
@@ -127,15 +151,16 @@ def replay_manual() -> None:
 
 	warm_up_time = (1 * 365 * 24 * 60 * 60) # TODO
 
-	with open("min_test.json", "r") as f:
+	with open("min_test.json", "rb") as f:
 		access_it = recorder.replay(f)
 		cache_sys = OnlineCacheSystem(processors, access_it)
-		#collections.deque(itertools.takewhile(lambda info: info.access.access_ts < warm_up_time, cache_sys), maxlen=0)
+		#consume(itertools.takewhile(lambda info: info.access.access_ts < warm_up_time, cache_sys))
 		#print_cache_stats(cache_sys.stats, prefix="[pre reset cache sys]")
 		#print("")
 		#print("")
 		#cache_sys.stats.reset()
-		collections.deque(cache_sys, maxlen=0)
+		with gc_paused():
+			consume(cache_sys)
 
 	print_cache_stats(cache_sys.stats, prefix="[cache sys]")
 
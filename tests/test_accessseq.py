@@ -2,10 +2,11 @@ import itertools
 import math
 import pytest
 import random
-from typing import cast, Iterable, Iterator, List, Sequence
+from typing import Any, Iterable, List, Sequence, Tuple
 
 from simulator.workload import Access, FileID
 from simulator.dstructures.accessseq import (
+	active_files_changes,
 	change_to_active_bytes,
 	change_to_active_files,
 	ReuseTimer,
@@ -13,18 +14,32 @@ from simulator.dstructures.accessseq import (
 )
 
 def access_seq_from_files(files: Iterable[FileID]) -> List[Access]:
-	def generator() -> Iterator[Access]:
-		parts = [(0, 1)]
-
-		for ts, file in enumerate(files):
-			yield Access(ts, file, parts)
-
-	return list(generator())
+	parts = [(0, 1)]
+	return [Access(ts, file, parts) for ts, file in enumerate(files)]
 
 def generate_access_seq(n_accesses: int, n_files: int) -> List[Access]:
+	# Seeded, so that each parametrisation is reproducible, also when tests
+	# are distributed across processes.
+	rng = random.Random(1)
 	files = list(map(str, range(n_files)))
 
-	return access_seq_from_files((random.choice(files) for _ in range(n_accesses)))
+	return access_seq_from_files(rng.choices(files, k=n_accesses))
+
+@pytest.fixture(scope='module', params=[
+	(100, 10),
+	(100, 90),
+	(1000, 10),
+	(1000, 100),
+	(1000, 900),
+], ids=lambda param: '{}-{}'.format(*param))
+def random_access_seq(request: Any) -> Tuple[List[Access], int]:
+	"""Random access sequence and the number of files it is drawn from.
+
+	Generated once per module and shared by the *_random tests, which must not
+	modify it.
+	"""
+	n_accesses, n_files = request.param
+	return generate_access_seq(n_accesses, n_files), n_files
 
 def _assert_reuse_timer_equals(r: ReuseTimer, reuse_inds: Sequence[int]) -> None:
 	l = len(reuse_inds)
@@ -47,15 +62,8 @@ def test_reuse_timer_basics() -> None:
 	r._verify(accesses)
 	_assert_reuse_timer_equals(r, [3, 4, 5, 5, 5])
 
-@pytest.mark.parametrize('n_accesses,n_files', (
-	(100, 10),
-	(100, 90),
-	(1000, 10),
-	(1000, 100),
-	(1000, 900),
-))
-def test_reuse_timer_random(n_accesses: int, n_files: int) -> None:
-	accesses = generate_access_seq(n_accesses, n_files)
+def test_reuse_timer_random(random_access_seq: Tuple[List[Access], int]) -> None:
+	accesses, _ = random_access_seq
 	r = ReuseTimer(accesses)
 	r._verify(accesses)
 
@@ -114,27 +122,13 @@ def test_full_reuse_index_accessed_after_and_before() -> None:
 	assert fri.accessed_before(5, fri.parts(5)) == [(0, 1)]
 	assert fri.accessed_before(6, fri.parts(6)) == [(0, 3)]
 
-@pytest.mark.parametrize('n_accesses,n_files', (
-	(100, 10),
-	(100, 90),
-	(1000, 10),
-	(1000, 100),
-	(1000, 900),
-))
-def test_full_reuse_index_random(n_accesses: int, n_files: int) -> None:
-	accesses = generate_access_seq(n_accesses, n_files)
+def test_full_reuse_index_random(random_access_seq: Tuple[List[Access], int]) -> None:
+	accesses, _ = random_access_seq
 	fri = FullReuseIndex(accesses)
 	fri._verify(accesses)
 
-@pytest.mark.parametrize('n_accesses,n_files', (
-	(100, 10),
-	(100, 90),
-	(1000, 10),
-	(1000, 100),
-	(1000, 900),
-))
-def test_change_to_active_files_random(n_accesses: int, n_files: int) -> None:
-	accesses = generate_access_seq(n_accesses, n_files)
+def test_change_to_active_files_random(random_access_seq: Tuple[List[Access], int]) -> None:
+	accesses, n_files = random_access_seq
 
 	fri = FullReuseIndex(accesses)
 	a = list(itertools.accumulate(change_to_active_files(fri, i) for i in range(len(accesses))))
@@ -143,6 +137,8 @@ def test_change_to_active_files_random(n_accesses: int, n_files: int) -> None:
 	for active_files in a:
 		active_files <= n_files
 
+	assert list(active_files_changes(fri)) == [change_to_active_files(fri, i) for i in range(len(accesses))]
+
 def test_change_to_active_files() -> None:
 	accesses = access_seq_from_files(['a', 'b', 'b', 'c', 'd', 'b', 'a'])
 
@@ -150,16 +146,10 @@ def test_change_to_active_files() -> None:
 	a = list(itertools.accumulate(change_to_active_files(fri, i) for i in range(len(accesses))))
 
 	assert a == [1, 2, 2, 2, 2, 1, 0]
+	assert list(itertools.accumulate(active_files_changes(fri))) == a
 
-@pytest.mark.parametrize('n_accesses,n_files', (
-	(100, 10),
-	(100, 90),
-	(1000, 10),
-	(1000, 100),
-	(1000, 900),
-))
-def test_change_to_active_bytes_random(n_accesses: int, n_files: int) -> None:
-	accesses = generate_access_seq(n_accesses, n_files)
+def test_change_to_active_bytes_random(random_access_seq: Tuple[List[Access], int]) -> None:
+	accesses, n_files = random_access_seq
 
 	fri = FullReuseIndex(accesses)
 	a = list(itertools.accumulate(change_to_active_bytes(fri, i) for i in range(len(accesses))))
@@ -1,7 +1,7 @@
 import itertools
 import pytest
 import random
-from typing import cast, Iterable, Iterator, List, TypeVar
+from typing import cast, Iterable, Iterator, List, Type, TypeVar
 
 from simulator.dstructures.binning import (
 	BinnedMapping,
@@ -80,6 +80,13 @@ def test_log_binner_basics() -> None:
 	b = LogBinner(first=5, last=8, step=4)
 	_assert_binner_equals(b, [0])
 
+def test_binner_fingerprint() -> None:
+	assert LogBinner(first=5, last=8, step=2).fingerprint == LogBinner(first=5, last=7, step=2).fingerprint
+	assert LogBinner(first=5, last=8, step=1).fingerprint != LogBinner(first=5, last=7, step=1).fingerprint
+	assert LogBinner(first=5, step=1).fingerprint != LogBinner(first=5, last=8, step=1).fingerprint
+	assert LinearBinner(10).fingerprint == LinearBinner(10).fingerprint
+	assert LinearBinner(10).fingerprint != LinearBinner(20).fingerprint
+
 @pytest.mark.parametrize('step', (1, 2, 3, 4))
 def test_bounded_log_binner(step: int) -> None:
 	b = LogBinner(first=10, last=40, step=step)
@@ -389,3 +396,45 @@ def test_unbounded_binned_sparse_mapping() -> None:
 	m_edges = m_edges[len(m_edges)//2:]
 	assert len(m) == len(m_edges)
 	assert list(m) == m_edges
+
+@pytest.mark.parametrize('default_factory', (int, float))
+@pytest.mark.parametrize('binner', (
+	LogBinner(first=10, last=20, step=1),
+	LogBinner(first=10, step=1),
+))
+def test_scalar_binned_mapping(default_factory: Type[float], binner: Binner) -> None:
+	m: BinnedMapping[float] = BinnedMapping(binner, default_factory)
+	check_count = binner.bins if binner.bounded else 20
+
+	edges = list(itertools.islice(binner.bin_edges(), check_count))
+
+	for edge, num in zip(edges, random_bin_nums(binner, n=check_count)):
+		m.add(num, 1)
+		m.add(edge, 2)
+
+	for num in random_bin_nums(binner, n=check_count):
+		assert m[num] == 3
+		assert isinstance(m[num], default_factory)
+
+	m.add_many(edges, range(check_count))
+
+	assert list(itertools.islice(m.values(), check_count)) == [3 + i for i in range(check_count)]
+
+@pytest.mark.parametrize('binner', (
+	LogBinner(first=10, last=20, step=1),
+	LogBinner(first=10, step=1),
+))
+def test_scalar_binned_mapping_large_ints(binner: Binner) -> None:
+	m: BinnedMapping[int] = BinnedMapping(binner, int)
+	num = next(iter(random_bin_nums(binner, n=1)))
+
+	m.add(num, 2 ** 63 - 1)
+	m.add(num, 1)
+	assert m[num] == 2 ** 63
+
+	m.add_many([num, num], [2 ** 64, -2 ** 66])
+	assert m[num] == 2 ** 63 + 2 ** 64 - 2 ** 66
+
+	m = BinnedMapping(binner, int)
+	m.add_many([num, num, num], [1, 2 ** 63, 2])
+	assert m[num] == 2 ** 63 + 3
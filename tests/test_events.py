@@ -0,0 +1,69 @@
+import random
+from typing import List, Tuple
+
+from simulator.events import EventIterator, EventMerger
+
+def test_event_merger() -> None:
+	rng = random.Random(1)
+	streams: List[List[Tuple[int, int]]] = [
+		sorted((rng.randrange(100), stream_ind) for _ in range(50))
+		for stream_ind in range(5)
+	] + [[]]
+
+	merged = list(EventMerger(streams, lambda ev: ev[0]))
+
+	assert len(merged) == 5 * 50
+	assert [ev[0] for ev in merged] == sorted(ev[0] for ev in merged)
+	for stream_ind in range(5):
+		assert [ev for ev in merged if ev[1] == stream_ind] == streams[stream_ind]
+
+def test_event_merger_ties() -> None:
+	# Events with equal time stamps are yielded in the order in which they
+	# were retrieved from their streams.
+	streams = [['a1', 'a2'], ['b1', 'b2']]
+
+	merged = list(EventMerger(streams, lambda ev: 0))
+
+	assert merged == ['a1', 'b1', 'a2', 'b2']
+
+	ts = {'a1': 0, 'a2': 0, 'a3': 1, 'b1': 0, 'b2': 1, 'c1': 0}
+	merged = list(EventMerger([['a1', 'a2', 'a3'], ['b1', 'b2'], ['c1']], ts.__getitem__))
+
+	assert merged == ['a1', 'b1', 'c1', 'a2', 'b2', 'a3']
+
+	merger = EventMerger(streams, lambda ev: 0)
+	assert iter(merger) is merger
+
+def test_event_iterator() -> None:
+	key_calls: List[int] = []
+
+	def key(ev: int) -> int:
+		key_calls.append(ev)
+		return ev * 10
+
+	it = EventIterator([1, 2, 3, 4], key)
+
+	assert it.next_with_ts() == (10, 1)
+	assert it.peek_ts() == 20
+	assert it.is_next_before(25)
+	assert it.next_if_before(25) == 2
+	assert it.next_if_before(25) is None
+	assert it.next_with_ts() == (30, 3)
+	assert it.next() == 4
+	assert key_calls == [1, 2, 3]
+
+def test_event_merger_event_iterators() -> None:
+	key_calls: List[int] = []
+
+	def key(ev: int) -> int:
+		key_calls.append(ev)
+		return ev
+
+	a, b = EventIterator([1, 4, 5], key), EventIterator([2, 3, 6], key)
+	assert a.peek_ts() == 1
+
+	merged = list(EventMerger([a, b], key))
+
+	assert merged == [1, 2, 3, 4, 5, 6]
+	# The key is computed once per event, the peeked time stamp is reused
+	assert sorted(key_calls) == [1, 2, 3, 4, 5, 6]
@@ -1,5 +1,7 @@
 from array import array
+import copy
 import itertools
+import pickle
 import pytest
 import random
 from typing import (
@@ -10,21 +12,18 @@ from typing import (
 	Iterable,
 	Iterator,
 	List,
-	Optional,
-	overload,
-	Reversible,
 	Tuple,
 	TypeVar,
 	Sequence,
 	Sized,
-	Union,
 	ValuesView,
 )
 from typing_extensions import Protocol
 
-from simulator.dstructures.binning import Binner, LogBinner
+from simulator.dstructures.binning import Binner, LinearBinner, LogBinner
 from simulator.dstructures.histogram import (
 	_ewma_update_array,
+	_scale_int_array,
 	BinnedCounters,
 	BinnedProbabilities,
 	CountedProbabilities,
@@ -52,25 +51,17 @@ class _BinnedArrayLike(Collection[int], Protocol[_T_num]):
 	def bin_data(self) -> 'array[_T_num]': ...
 
 	def __getitem__(self, key: int) -> _T_num: ...
-	@overload
-	def get(self, key: int) -> Optional[_T_num]: ...
-	@overload
-	def get(self, key: int, default: Union[_T_num, _T]) -> Union[_T_num, _T]: ...
 	def items(self) -> AbstractSet[Tuple[int, _T_num]]: ...
 	def keys(self) -> AbstractSet[int]: ...
 	def values(self) -> ValuesView[_T_num]: ...
 
 
-def _drop_last_while(pred: Callable[[_T], bool], it: Iterable[_T]) -> Iterable[_T]:
-	reversible_it: Reversible[_T]
-	if isinstance(it, Reversible):
-		reversible_it = it
-	else:
-		reversible_it = list(it)
-
-	return reversed(list(
-		itertools.dropwhile(pred, reversed(reversible_it)),
-	))
+def _drop_last_while(pred: Callable[[_T], bool], it: Iterable[_T]) -> List[_T]:
+	items = list(it)
+	end = len(items)
+	while end > 0 and pred(items[end - 1]):
+		end -= 1
+	return items[:end]
 
 def _assert_binned_array_equal(a: _BinnedArrayLike[_T_num], values: Sequence[_T_num]) -> None:
 	b = a.binner
@@ -102,13 +93,14 @@ def _assert_binned_array_equal(a: _BinnedArrayLike[_T_num], values: Sequence[_T_
 	assert a.total == sum(values)
 
 	if b.bounded:
-		assert list(a.bin_data) == list(values)
+		# Arrays of the same type code are compared without boxing elements
+		assert a.bin_data == array(a.bin_data.typecode, values)
 	else:
 		is_zero = lambda val: val == 0
 		assert (
-				list(_drop_last_while(is_zero, a.bin_data))
+				_drop_last_while(is_zero, a.bin_data.tolist())
 			==
-				list(_drop_last_while(is_zero, values))
+				_drop_last_while(is_zero, values)
 		)
 
 	assert list(slice_for_assert(a.values())) == list(values)
@@ -158,6 +150,7 @@ def _assert_binned_array_basics(
 @pytest.fixture(params=[
 	(LogBinner, tuple(), {}), # type: ignore[no-untyped-def]
 	(LogBinner, (), {'first': 9, 'last': 20}),
+	(LinearBinner, (10,), {}),
 ])
 def any_binner(request) -> Binner:
 	return cast(Binner, request.param[0](*request.param[1], **request.param[2]))
@@ -172,6 +165,19 @@ def test_ewma_update_array() -> None:
 	_ewma_update_array(orig, inp, 1/2, int)
 	assert list(orig) == [5] * 2 + [0] * 8 + [3] * 2
 
+def test_scale_int_array() -> None:
+	arr = array('Q', [0, 1, 2, 3, 7, 2 ** 60 + 1])
+
+	assert _scale_int_array(arr, 'Q', 1/2) == 2 ** 59 + 5
+	assert list(arr) == [0, 0, 1, 1, 3, 2 ** 59]
+
+	assert _scale_int_array(arr, 'Q', 1/4) == 2 ** 57
+	assert list(arr) == [0, 0, 0, 0, 0, 2 ** 57]
+
+	arr = array('Q', [0, 1, 2, 3, 10])
+	assert _scale_int_array(arr, 'Q', 0.3) == 3
+	assert list(arr) == [0, 0, 0, 0, 3]
+
 def test_binned_counters(any_binner: Binner) -> None:
 	b, c = any_binner, BinnedCounters(any_binner)
 
@@ -224,6 +230,31 @@ def test_binned_counters(any_binner: Binner) -> None:
 		assert c[first] == c[past - 1]
 	_assert_binned_array_equal(c, list(range(check_count)) + [0] * post_check_count)
 
+def test_binned_counters_increment_many(any_binner: Binner) -> None:
+	b, c, c_ref = any_binner, BinnedCounters(any_binner), BinnedCounters(any_binner)
+
+	check_count = b.bins if b.bounded else 20
+
+	# Each bin i receives i numbers
+	nums = [
+		num
+		for i, first_num in enumerate(random_bin_nums(b, n=check_count))
+		for num in itertools.repeat(first_num, i)
+	]
+	random.shuffle(nums)
+
+	c.increment_many(nums, 2)
+	for num in nums:
+		c_ref.increment(num, 2)
+
+	_assert_binned_array_basics(b, c)
+	_assert_binned_array_equal(c, [2 * i for i in range(check_count)])
+	assert list(c.bin_data) == list(c_ref.bin_data)
+	assert c.total == c_ref.total
+
+	c.increment_many([])
+	assert c.total == c_ref.total
+
 def test_binned_counters_update(any_binner: Binner) -> None:
 	b, c = any_binner, BinnedCounters(any_binner)
 	c_tmp = BinnedCounters(any_binner)
@@ -243,6 +274,24 @@ def test_binned_counters_update(any_binner: Binner) -> None:
 
 	_assert_binned_array_equal(c, [2] * 2 + [0] * 8 + [6] * 2)
 
+def test_binned_counters_update_batch(any_binner: Binner) -> None:
+	b, c = any_binner, BinnedCounters(any_binner)
+	c_tmp_1, c_tmp_2 = BinnedCounters(any_binner), BinnedCounters(any_binner)
+
+	vals = [0] * 10 + [8] * 2
+	for num, val in zip(random_bin_nums(b), vals):
+		c[num] = val
+
+	vals = [8] * 2 + [0] * 10
+	for num, val in zip(random_bin_nums(b), vals):
+		c_tmp_1[num] = val
+		c_tmp_2[num] = val
+
+	c.update_batch([c_tmp_1, c_tmp_2], ewma_factor=1/2)
+
+	# Same as c.update(c_tmp_1, 1/2) followed by c.update(c_tmp_2, 1/2)
+	_assert_binned_array_equal(c, [6] * 2 + [0] * 8 + [2] * 2)
+
 def test_binned_counters_set_bin_data(any_binner: Binner) -> None:
 	b, c = any_binner, BinnedCounters(any_binner)
 
@@ -251,6 +300,11 @@ def test_binned_counters_set_bin_data(any_binner: Binner) -> None:
 	_assert_binned_array_basics(b, c)
 	_assert_binned_array_equal(c, vals)
 
+	vals = [1] * 12
+	c.set_bin_data(array('Q', vals), total=12)
+	_assert_binned_array_basics(b, c)
+	_assert_binned_array_equal(c, vals)
+
 def test_halving_binned_counters(any_binner: Binner) -> None:
 	# TODO: test passing max_total and passing (max_bin, max_total)
 	b, c = any_binner, HalvingBinnedCounters(any_binner, factor=1/2, max_bin=10)
@@ -296,6 +350,28 @@ def test_halving_binned_counters(any_binner: Binner) -> None:
 	_assert_binned_array_basics(b, c)
 	_assert_binned_array_equal(c, [0] * check_count)
 
+def test_halving_binned_counters_overflow(any_binner: Binner) -> None:
+	b, c = any_binner, HalvingBinnedCounters(any_binner, factor=1/2, max_bin=10)
+
+	check_count = b.bins if b.bounded else 20
+	num = b.bin_limits(check_count - 1)[0]
+
+	# Bins are stored with a narrow type code, values exceeding it are
+	# still handled.
+	c.increment(num, incr=2 ** 40)
+	vals = [0] * check_count
+	vals[b(num)] = 2 ** 39
+	_assert_binned_array_equal(c, vals)
+	assert c.total == 2 ** 39
+
+	c[num] = 2 ** 41
+	vals[b(num)] = 2 ** 40
+	_assert_binned_array_equal(c, vals)
+	assert c.total == 2 ** 40
+
+	with pytest.raises(OverflowError):
+		c.decrement(num, decr=2 ** 41)
+
 def test_binned_probabilities(any_binner: Binner) -> None:
 	b, c = any_binner, BinnedCounters(any_binner)
 
@@ -381,3 +457,80 @@ def test_counted_probabilities(any_binner: Binner) -> None:
 		p.reset()
 	with pytest.raises(TypeError):
 		p[num] = 0.2
+
+def test_counted_probabilities_update_batch(any_binner: Binner) -> None:
+	b, c = any_binner, BinnedCounters(any_binner)
+	c_tmp = BinnedCounters(any_binner)
+
+	vals = [0] * 10 + [8] * 2
+	for num, val in zip(random_bin_nums(b), vals):
+		c[num] = val
+
+	vals = [8] * 2 + [0] * 10
+	for num, val in zip(random_bin_nums(b), vals):
+		c_tmp[num] = val
+
+	p = CountedProbabilities.from_counters(c)
+	with pytest.raises(ValueError):
+		# Raises as ewma_factor must be passed
+		p.update_batch([c_tmp])
+
+	p.update_batch([c_tmp, c_tmp], ewma_factor=1/2)
+	# Internal counters should now be: [6] * 2 + [0] * 8 + [2] * 2
+
+	assert sum(p.bin_data) == p.total
+	assert p.total == 1.0
+
+	_assert_binned_array_equal(p, [6/16] * 2 + [0.0] * 8 + [2/16] * 2)
+
+def test_halving_binned_counters_bin_data_type_code(any_binner: Binner) -> None:
+	b, h = any_binner, HalvingBinnedCounters(any_binner, factor=1/2, max_bin=10)
+	num = next(iter(random_bin_nums(b)))
+	h.increment(num, 5)
+
+	# The narrow type code of HalvingBinnedCounters is not adopted
+	c = BinnedCounters(b)
+	c.set_bin_data(h.bin_data)
+	c.increment(num, 2 ** 40)
+	assert c[num] == 5 + 2 ** 40
+
+	p = CountedProbabilities.from_counters(h, ewma_factor=1/2)
+	large = BinnedCounters(b)
+	large.increment(num, 2 ** 40)
+	p.update(large)
+	assert p[num] == 1.0
+
+def test_binned_arrays_copy(any_binner: Binner) -> None:
+	b = any_binner
+	num = next(iter(random_bin_nums(b)))
+
+	for c, cls in (
+		(BinnedCounters(b), BinnedCounters),
+		(HalvingBinnedCounters(b, factor=1/2, max_bin=10), HalvingBinnedCounters),
+	):
+		c.increment(num, 3)
+		assert repr(c).startswith(f'<simulator.dstructures.histogram.{cls.__name__} object')
+
+		shallow, deep = copy.copy(c), copy.deepcopy(c)
+		assert isinstance(shallow, cls) and isinstance(deep, cls)
+		assert list(shallow.bin_data) == list(c.bin_data)
+		assert list(deep.bin_data) == list(c.bin_data)
+		assert (shallow[num], deep[num]) == (3, 3)
+
+		deep.increment(num)
+		assert (c[num], deep[num]) == (3, 4)
+		assert (c.total, deep.total) == (3, 4)
+
+def test_binned_arrays_pickle() -> None:
+	# LogBinner instances hold local functions and can not be pickled, hence
+	# only LinearBinner is used.
+	c = BinnedCounters(LinearBinner(10))
+	c.increment(25, 3)
+
+	c2 = pickle.loads(pickle.dumps(c))
+	assert isinstance(c2, BinnedCounters)
+	assert list(c2.bin_data) == list(c.bin_data)
+	assert c2.total == 3
+
+	c2.increment(29)
+	assert c2[20] == 4
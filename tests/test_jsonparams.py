@@ -3,6 +3,7 @@ import jsonschema
 import pytest
 
 from simulator.workload.jsonparams import (
+	_load_validator,
 	load_validate_transform,
 	parse_bytes_rate,
 	parse_bytes_size,
@@ -103,3 +104,27 @@ def test_load_validate_transform() -> None:
 			(('rate',), 'bytes_rate'),
 		],
 	)['size'] == 10 * GiB
+
+	# Transformations of absent fields are skipped
+	assert load_validate_transform(
+		StringIO(_correct_example),
+		'test_jsonparams_simple_schema.json',
+		schema_package = __name__,
+		transformations = [
+			(('missing', 'size'), 'bytes_size'),
+			(('missing',), 'bytes_size'),
+			(('count', 'size'), 'bytes_size'),
+			(('size',), 'bytes_size'),
+		],
+	)['size'] == 10 * GiB
+
+def test_load_validator_memoised() -> None:
+	validator = _load_validator(__name__, 'test_jsonparams_simple_schema.json')
+
+	load_validate_transform(
+		StringIO(_correct_example),
+		'test_jsonparams_simple_schema.json',
+		schema_package = __name__,
+	)
+
+	assert _load_validator(__name__, 'test_jsonparams_simple_schema.json') is validator
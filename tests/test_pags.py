@@ -0,0 +1,23 @@
+import itertools
+
+from simulator.workload.models.pags import SimpleNoiseNode
+
+def test_simple_noise_files() -> None:
+	submitter = next(iter(SimpleNoiseNode(10, 3, 4)))
+	base = f'{id(submitter)}/'
+
+	jobs = list(itertools.islice(iter(submitter), 7))
+
+	assert [job.submit_ts for job in jobs] == [0, 3, 5, 8, 10, 13, 15]
+	assert [job.access_requests[0].file for job in jobs] == [
+		f'{base}{i // 3}/{i}' for i in range(7)
+	]
+	assert all(list(job.access_requests[0].parts) == [(0, 10)] for job in jobs)
+
+def test_simple_noise_files_flat() -> None:
+	submitter = next(iter(SimpleNoiseNode(10, 0, 4)))
+	base = f'{id(submitter)}/'
+
+	jobs = list(itertools.islice(iter(submitter), 7))
+
+	assert [job.access_requests[0].file for job in jobs] == [f'{base}{i}' for i in range(7)]
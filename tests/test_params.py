@@ -190,6 +190,7 @@ def test_simple_field(raw: str, value: str) -> None:
 	assert evaluated_field.name == field_name
 	assert evaluated_field.value == value + 'postfix'
 	assert conv_call_counter == 1
+	assert lex.get_token() in (',', lex.eof)
 
 def test_parse_simple() -> None:
 	class Collector(object):
@@ -212,3 +213,108 @@ def test_parse_simple() -> None:
 	assert c.a == -334
 	assert c.b == 'tag'
 	assert c.another_field == 'size&dirname'
+
+@pytest.mark.parametrize(
+	'user_args',
+	(
+		'a=-334,b=tag,another_field=size&dirname',
+		' a=-334 , b=tag,another_field=size&dirname,',
+		'a=-334,b="tag",another_field=size&dirname',
+		'a=-334,b=t\\ag,another_field="size&dirname"',
+	),
+)
+def test_parse_fast_and_quoted(user_args: str) -> None:
+	class Collector(object):
+		a: int
+		b: str
+		another_field: str
+
+	c = Collector()
+
+	parse_user_args(
+		user_args,
+		c,
+		[
+			SimpleField('a', int),
+			SimpleField('b', lambda val: val.strip()),
+			SimpleField('another_field', str)
+		],
+	)
+
+	assert c.a == -334
+	assert c.b == 'tag'
+	assert c.another_field == 'size&dirname'
+
+def test_parse_unknown_name() -> None:
+	class Collector(object):
+		a: int
+
+	with pytest.raises(Exception, match='unknown name'):
+		parse_user_args('a=1,c=2', Collector(), [SimpleField('a', int)])
+
+@pytest.mark.parametrize(
+	'value,expected',
+	(
+		('plain', 'plain'),
+		('"a,b"', 'a,b'),
+		('"a\\"b\\\\c\\d"', 'a"b\\c\\d'),
+		("'a\\b'", 'a\\b'),
+		('a\\,b', 'a,b'),
+		(' "a" b\'c\'', ' a bc'),
+	),
+)
+def test_parse_quoted(value: str, expected: str) -> None:
+	class Collector(object):
+		a: str
+		b: int
+
+	c = Collector()
+
+	parse_user_args(f'a={value},b=1', c, [SimpleField('a', str), SimpleField('b', int)])
+
+	assert c.a == expected
+	assert c.b == 1
+	# Same as reading the value through shlex
+	assert SimpleField('a', str).parse(shlex(value, posix=True)).value == expected
+
+@pytest.mark.parametrize(
+	'user_args,expected',
+	(
+		# Comments, escapes and quoted ',' are read like shlex does
+		('a=x,b=1, # comment', 'x'),
+		('\\a=x,b=1', 'x'),
+		('b=1,a=\\,', ''),
+		("b=1,a=','", ''),
+		("'a'=x,b=1", 'x'),
+	),
+)
+def test_parse_shlex_compatible(user_args: str, expected: str) -> None:
+	class Collector(object):
+		a: str
+		b: int
+
+	c = Collector()
+
+	parse_user_args(user_args, c, [SimpleField('a', str), SimpleField('b', int)])
+
+	assert c.a == expected
+	assert c.b == 1
+
+def test_parse_memoised() -> None:
+	conv_calls: List[str] = []
+
+	def conv(val: str) -> int:
+		conv_calls.append(val)
+		return int(val)
+
+	class Collector(object):
+		a: int
+
+	for _ in range(3):
+		c = Collector()
+		parse_user_args('a=12', c, [SimpleField('a', conv)])
+		assert c.a == 12
+
+	assert conv_calls == ['12']
+	assert SimpleField('a', conv) == SimpleField('a', conv)
+	assert SimpleField('a', conv) != SimpleField('b', conv)
@@ -0,0 +1,220 @@
+import io
+import itertools
+import pathlib
+import random
+from typing import Callable, List, Tuple
+
+import orjson
+import pytest
+
+from simulator.cache.processor import AccessInfo
+from simulator.distributor import AccessAssignment
+from simulator.recorder import (
+	_BINARY_HEADER,
+	_count_records,
+	_forwards_cursor,
+	passthrough_record,
+	Predicate,
+	Reader,
+	record,
+	record_access_info,
+	record_path,
+	replay,
+	replay_access_info,
+	replay_batch,
+	reverse_replay,
+)
+from simulator.workload import Access
+
+def _assgnms(n: int) -> List[AccessAssignment]:
+	rng = random.Random(1)
+	return [
+		AccessAssignment(
+			Access(
+				ts,
+				f'file-{rng.randrange(100)}',
+				[(part_ind, rng.randrange(2 ** 40)) for part_ind in range(rng.randrange(5))],
+			),
+			rng.randrange(4),
+		)
+		for ts in range(n)
+	]
+
+def _assgnm_tuple(assgnm: AccessAssignment) -> object:
+	access = assgnm.access
+	return (access.access_ts, access.file, list(access.parts), assgnm.cache_proc)
+
+@pytest.mark.parametrize('binary', (False, True))
+def test_record_replay(binary: bool) -> None:
+	# Enough assignments to span multiple chunks when reading in reverse.
+	assgnms = _assgnms(10000)
+	expected = list(map(_assgnm_tuple, assgnms))
+
+	file = io.BytesIO()
+	record(file, assgnms, binary=binary)
+
+	assert list(map(_assgnm_tuple, replay(file))) == expected
+	assert list(map(_assgnm_tuple, reverse_replay(file))) == expected[::-1]
+
+	accesses = [assgnm.access for assgnm in assgnms if assgnm.cache_proc == 1]
+	assert [
+		(access.access_ts, access.file) for access in _forwards_cursor(file, 1)
+	] == [
+		(access.access_ts, access.file) for access in accesses
+	]
+
+@pytest.mark.parametrize('binary', (False, True))
+def test_replay_batch(binary: bool) -> None:
+	assgnms = _assgnms(1000)
+
+	file = io.BytesIO()
+	record(file, assgnms, binary=binary)
+
+	batches = list(replay_batch(file, batch_size=300))
+
+	assert list(map(len, batches)) == [300, 300, 300, 100]
+	assert [
+		_assgnm_tuple(assgnm) for batch in batches for assgnm in batch
+	] == list(map(_assgnm_tuple, assgnms))
+	assert sum(sum(batch.parts_size) for batch in batches) == sum(
+		size for assgnm in assgnms for _, size in assgnm.access.parts
+	)
+
+def test_json_lines_format() -> None:
+	assgnm = _assgnms(1)[0]
+	access = assgnm.access
+	info = AccessInfo(access, access.parts[:1], True, 1, 2, 3, 4, 5, ['evicted'])
+
+	file = io.BytesIO()
+	record(file, [assgnm])
+	assert file.getvalue() == orjson.dumps({
+		'access': {'access_ts': access.access_ts, 'file': access.file, 'parts': access.parts},
+		'cache_proc': assgnm.cache_proc,
+	}) + b'\n'
+
+	file = io.BytesIO()
+	record_access_info(file, [info])
+	assert file.getvalue() == orjson.dumps({
+		'access': {'access_ts': access.access_ts, 'file': access.file, 'parts': access.parts},
+		'hit_parts': info.hit_parts,
+		'file_hit': True,
+		'bytes_hit': 1,
+		'bytes_missed': 2,
+		'bytes_added': 3,
+		'bytes_removed': 4,
+		'total_bytes': 5,
+		'evicted_files': ['evicted'],
+	}) + b'\n'
+
+def test_count_records() -> None:
+	assert _count_records(io.BytesIO()) == 0
+	assert _count_records(io.BytesIO(b'{}\n{}\n')) == 2
+	assert _count_records(io.BytesIO(b'{}\n{}')) == 2
+	assert _count_records(io.BytesIO(b'{}\n{}\n{}\n'), begin_pos=3, end_pos=6) == 1
+
+	file = io.BytesIO()
+	record(file, _assgnms(10), binary=True)
+	assert _count_records(file) == 10
+	first_frame_end = len(_BINARY_HEADER) + 8 + int.from_bytes(file.getvalue()[len(_BINARY_HEADER):len(_BINARY_HEADER) + 4], 'little')
+	assert _count_records(file, end_pos=first_frame_end) == 1
+	assert _count_records(file, begin_pos=first_frame_end) == 9
+
+def test_binary_record_is_smaller() -> None:
+	assgnms = _assgnms(100)
+
+	json_file, binary_file = io.BytesIO(), io.BytesIO()
+	assert list(passthrough_record(json_file, assgnms)) == assgnms
+	assert list(passthrough_record(binary_file, assgnms, binary=True)) == assgnms
+
+	assert len(binary_file.getvalue()) < len(json_file.getvalue())
+
+@pytest.mark.parametrize('binary', (False, True))
+def test_passthrough_record_partial(tmp_path: pathlib.Path, binary: bool) -> None:
+	assgnms = _assgnms(100)
+
+	path = tmp_path / 'accesses'
+	with open(path, mode='wb') as file:
+		it = passthrough_record(file, assgnms, binary=binary)
+		assert list(itertools.islice(it, 5)) == assgnms[:5]
+
+	with open(path, mode='rb') as file:
+		assert list(map(_assgnm_tuple, replay(file))) == list(map(_assgnm_tuple, assgnms[:5]))
+
+@pytest.mark.parametrize('binary', (False, True))
+def test_record_replay_access_info(binary: bool) -> None:
+	infos = [
+		AccessInfo(assgnm.access, assgnm.access.parts[:1], ind % 2 == 0, ind, 2 * ind, 3 * ind, 4 * ind, 5 * ind, [f'evicted-{ind}'] * (ind % 3))
+		for ind, assgnm in enumerate(_assgnms(100))
+	]
+
+	file = io.BytesIO()
+	record_access_info(file, infos, binary=binary)
+
+	for info, replayed in zip(infos, replay_access_info(file)):
+		assert (
+			info.access.access_ts, info.access.file, list(info.access.parts),
+			list(info.hit_parts), info.file_hit, info.bytes_hit, info.bytes_missed,
+			info.bytes_added, info.bytes_removed, info.total_bytes, list(info.evicted_files),
+		) == (
+			replayed.access.access_ts, replayed.access.file, list(replayed.access.parts),
+			list(replayed.hit_parts), replayed.file_hit, replayed.bytes_hit, replayed.bytes_missed,
+			replayed.bytes_added, replayed.bytes_removed, replayed.total_bytes, list(replayed.evicted_files),
+		)
+	assert len(list(replay_access_info(file))) == len(infos)
+
+@pytest.mark.parametrize('binary', (False, True))
+def test_reader(tmp_path: pathlib.Path, binary: bool) -> None:
+	assgnms = _assgnms(10000)
+	expected = list(map(_assgnm_tuple, assgnms))
+
+	path = tmp_path / 'accesses'
+	record_path(path, assgnms, binary=binary)
+
+	assert len(Reader(path)) == len(expected)
+	assert len(Reader(path).scope_to_cache_processor(1)) == sum(1 for assgnm in assgnms if assgnm.cache_proc == 1)
+
+	reader = Reader(path)
+	assert list(map(_assgnm_tuple, reader)) == expected
+	assert list(map(_assgnm_tuple, reversed(reader))) == expected[::-1]
+	assert len(reader) == len(expected)
+
+class _TimeRangePredicate(Predicate):
+	def __init__(self, begin_ts: int, end_ts: int, bisect: bool) -> None:
+		self._begin_ts: int = begin_ts
+		self._end_ts: int = end_ts
+		self._bisect: bool = bisect
+
+	@property
+	def action(self) -> Predicate.Action:
+		return Predicate.Action.YieldOnly
+
+	@property
+	def style(self) -> Predicate.Style:
+		return Predicate.Style.OneRange
+
+	def __call__(self, assgnm: AccessAssignment) -> bool:
+		return self._begin_ts <= assgnm.access.access_ts < self._end_ts
+
+	def key_range(self) -> Tuple[Callable[[AccessAssignment], int], int, int]:
+		if not self._bisect:
+			raise NotImplementedError
+		return (lambda assgnm: assgnm.access.access_ts), self._begin_ts, self._end_ts
+
+@pytest.mark.parametrize('binary', (False, True))
+@pytest.mark.parametrize('bisect', (False, True))
+@pytest.mark.parametrize('begin_ts,end_ts', ((100, 250), (0, 10), (990, 2000), (400, 400)))
+def test_reader_predicate(tmp_path: pathlib.Path, binary: bool, bisect: bool, begin_ts: int, end_ts: int) -> None:
+	# Every time stamp occurs twice
+	assgnms = sorted(_assgnms(1000) + _assgnms(1000), key=lambda assgnm: assgnm.access.access_ts)
+	expected = [
+		_assgnm_tuple(assgnm) for assgnm in assgnms
+		if begin_ts <= assgnm.access.access_ts < end_ts
+	]
+
+	path = tmp_path / 'accesses'
+	record_path(path, assgnms, binary=binary)
+
+	reader = Reader(path, predicate=_TimeRangePredicate(begin_ts, end_ts, bisect))
+	assert len(reader) == len(expected)
+	assert list(map(_assgnm_tuple, reader)) == expected
+	assert list(map(_assgnm_tuple, reversed(reader))) == expected[::-1]
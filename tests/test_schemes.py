@@ -1,5 +1,4 @@
 import collections
-import functools
 import math
 import pytest
 from typing import Dict, List
@@ -15,16 +14,16 @@ from simulator.workload.schemes import NonCorrelatedSchemesGenerator
 def test_non_correlated_schemes_generator(file_size: int, number: int, fraction: float) -> None:
 	s = NonCorrelatedSchemesGenerator(number, fraction)
 	schemes = [s.parts(i, file_size) for i in range(number)]
+	assert [s.with_index(i).parts(file_size) for i in range(number)] == schemes
 
 	scheme_byte_counts = [sum(part[1] for part in scheme) for scheme in schemes]
 	assert scheme_byte_counts == [scheme_byte_counts[0]] * number
 	assert scheme_byte_counts[0] / file_size - fraction < 0.0001
 
-	parts_dict: Dict[int, List[int]] = functools.reduce(
-		lambda d, part: (d[part[0]].append(part[1]), d)[1], # type: ignore[func-returns-value]
-		(part for parts in schemes for part in parts),
-		collections.defaultdict(list),
-	)
+	parts_dict: Dict[int, List[int]] = collections.defaultdict(list)
+	for parts in schemes:
+		for part_index, byte_count in parts:
+			parts_dict[part_index].append(byte_count)
 
 	for index, byte_counts in parts_dict.items():
 		exp = byte_counts[0]
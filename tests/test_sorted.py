@@ -1,54 +1,171 @@
 import itertools
 import random
-from typing import Callable, Collection, List, TypeVar
+from typing import Any, Iterable, List, MutableMapping, TypeVar
 
-from simulator.dstructures.sorted import SortedDefaultDict
+import pytest
+
+from simulator.dstructures.sorted import LazySortedDefaultDict, SortedDefaultDict
 
 _KT = TypeVar('_KT')
 _VT = TypeVar('_VT')
 
 def _assert_order(
-	d: SortedDefaultDict[_KT, _VT],
-	keys: Collection[_KT],
-	val_func: Callable[[_KT], _VT],
+	d: MutableMapping[_KT, _VT],
+	keys: Iterable[_KT],
+	values: Iterable[_VT],
 ) -> None:
-	assert list(d) == list(keys)
-	assert list(d.keys()) == list(keys)
-	assert list(d.values()) == list(map(val_func, keys))
-	assert list(d.items()) == list(zip(keys, map(val_func, keys)))
-
-def test_sorted_default_dict_set() -> None:
+	# Each view is iterated separately, as the views are implemented
+	# independently of iter(d).
+	expected_keys = list(keys)
+	expected_values = list(values)
+
+	assert list(d) == expected_keys
+	assert list(d.keys()) == expected_keys
+	assert list(d.values()) == expected_values
+	assert list(d.items()) == list(zip(expected_keys, expected_values))
+
+@pytest.fixture(scope='module', params=[10, 10000])
+def shuffled_keys(request: Any) -> List[int]:
+	"""Keys 0 to n-1 in a random (seeded) order, shared by the module's tests.
+
+	The larger n makes the cost of the sorted containers rather than of the
+	interpreter dominate.
+	"""
+	l = list(range(request.param))
+	random.Random(0).shuffle(l)
+	return l
+
+def test_sorted_default_dict_set(shuffled_keys: List[int]) -> None:
+	n = len(shuffled_keys)
 	d: SortedDefaultDict[int, int] = SortedDefaultDict(lambda: 0)
 
-	l = list(range(10))
-	random.shuffle(l)
-
-	for el in l:
+	for el in shuffled_keys:
 		d[el] = el
 
-	_assert_order(d, range(10), lambda x: x)
+	_assert_order(d, range(n), range(n))
 
-def test_sorted_default_dict_default_construct() -> None:
-	d: SortedDefaultDict[int, List[int]] = SortedDefaultDict(list)
+def test_sorted_default_dict_bulk(shuffled_keys: List[int]) -> None:
+	n = len(shuffled_keys)
+	half = n // 2
 
-	l = list(range(10))
-	random.shuffle(l)
+	# Bulk construction and update sort all keys at once instead of
+	# inserting one key at a time.
+	d: SortedDefaultDict[int, int] = SortedDefaultDict(lambda: 0, ((el, el) for el in shuffled_keys[:half]))
+	_assert_order(d, sorted(shuffled_keys[:half]), sorted(shuffled_keys[:half]))
+
+	d.update((el, el) for el in shuffled_keys[half:])
+	_assert_order(d, range(n), range(n))
+
+	assert d[n] == 0
+
+def test_sorted_default_dict_default_construct(shuffled_keys: List[int]) -> None:
+	n = len(shuffled_keys)
+	d: SortedDefaultDict[int, List[int]] = SortedDefaultDict(list)
 
-	for el in l:
+	for el in shuffled_keys:
 		d[el].append(el)
 
-	_assert_order(d, range(10), lambda x: [x])
+	_assert_order(d, range(n), [[x] for x in range(n)])
 
-def test_sorted_default_dict_del() -> None:
+def test_sorted_default_dict_del(shuffled_keys: List[int]) -> None:
+	n = len(shuffled_keys)
+	half = n // 2
 	d: SortedDefaultDict[int, int] = SortedDefaultDict(lambda: 0)
 
-	l = list(range(10))
-	random.shuffle(l)
-
-	for el in l:
+	for el in shuffled_keys:
 		d[el] += el
 
-	for el in range(5):
+	for el in range(3):
 		del d[el]
+	_assert_order(d, range(3, n), range(3, n))
+
+	# Bulk deletion of the smallest keys through the keys view
+	del d.keys()[:half - 3]
+	_assert_order(d, range(half, n), range(half, n))
+
+def test_lazy_sorted_default_dict(shuffled_keys: List[int]) -> None:
+	n = len(shuffled_keys)
+	half = n // 2
+	d: LazySortedDefaultDict[int, List[int]] = LazySortedDefaultDict(list)
+
+	for el in shuffled_keys[:half]:
+		d[el].append(el)
+	keys = sorted(shuffled_keys[:half])
+	_assert_order(d, keys, [[x] for x in keys])
+
+	for el in shuffled_keys[half:]:
+		d[el].append(el)
+	_assert_order(d, range(n), [[x] for x in range(n)])
 
-	_assert_order(d, range(5, 10), lambda x: x)
+	for el in range(half):
+		del d[el]
+	_assert_order(d, range(half, n), [[x] for x in range(half, n)])
+
+	assert 3 not in d
+
+	d_no_default: LazySortedDefaultDict[int, int] = LazySortedDefaultDict()
+	with pytest.raises(KeyError):
+		d_no_default[0]
+
+def test_lazy_sorted_default_dict_get_pop_setdefault() -> None:
+	d: LazySortedDefaultDict[int, List[int]] = LazySortedDefaultDict(list)
+	d[1].append(1)
+
+	# Same results as SortedDefaultDict, the default factory is not called
+	assert d.get(0) is None
+	assert d.pop(0, [2]) == [2]
+	with pytest.raises(KeyError):
+		d.pop(0)
+	assert 0 not in d
+	assert d.setdefault(0, [3]) == [3]
+	_assert_order(d, [0, 1], [[3], [1]])
+
+	assert d.get(1) == [1]
+	assert d.pop(1) == [1]
+	_assert_order(d, [0], [[3]])
+
+def test_lazy_sorted_default_dict_popitem_clear(shuffled_keys: List[int]) -> None:
+	n = len(shuffled_keys)
+	d: LazySortedDefaultDict[int, int] = LazySortedDefaultDict(int)
+	sd: SortedDefaultDict[int, int] = SortedDefaultDict(int)
+	for el in shuffled_keys:
+		d[el] = sd[el] = el
+
+	# Items are popped starting from the largest key, as with SortedDict
+	assert [d.popitem() for _ in range(3)] == [sd.popitem() for _ in range(3)]
+	_assert_order(d, range(n - 3), range(n - 3))
+
+	d[n] = n
+	assert d.popitem() == (n, n)
+
+	d.clear()
+	assert len(d) == 0
+	_assert_order(d, [], [])
+	with pytest.raises(KeyError):
+		d.popitem()
+
+	d[1] = 1
+	_assert_order(d, [1], [1])
+
+def test_lazy_sorted_default_dict_modify_while_iterating() -> None:
+	d: LazySortedDefaultDict[int, int] = LazySortedDefaultDict(int, {0: 0, 1: 1, 2: 2})
+
+	with pytest.raises(RuntimeError):
+		for key, _ in d.items():
+			del d[key]
+	_assert_order(d, [1, 2], [1, 2])
+
+	with pytest.raises(RuntimeError):
+		for key in d:
+			d[key + 10] = key
+	_assert_order(d, [1, 2, 11], [1, 2, 1])
+
+	# Updating values of existing keys is fine
+	for key in d:
+		d[key] += 1
+	_assert_order(d, [1, 2, 11], [2, 3, 2])
+
+	with pytest.raises(RuntimeError):
+		for key in d:
+			d.popitem()
+	_assert_order(d, [1, 2], [2, 3])
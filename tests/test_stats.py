@@ -0,0 +1,35 @@
+from simulator.cache.stats import TotalStats as CacheTotalStats
+from simulator.workload import Access
+from simulator.workload.stats import StatsCounters
+
+def test_stats_counters() -> None:
+	counters = StatsCounters()
+
+	counters.process_access(Access(1, 'a', [(0, 10), (6, 5)]))
+	counters.process_access(Access(2, 'b', [(1, 3)]))
+	counters.process_access(Access(4, 'a', [(0, 20), (6, 2)]))
+
+	a = counters.file_stats('a')
+	assert (a.accesses, a.total_bytes_accessed, a.unique_bytes_accessed) == (2, 37, 25)
+	assert (a.first_access_time, a.last_access_time) == (1, 4)
+	# Only accessed parts are tracked
+	assert sorted(a.parts) == [0, 6]
+	assert (a.parts[0].accesses, a.parts[0].total_bytes_accessed, a.parts[0].unique_bytes_accessed) == (2, 30, 20)
+	assert (a.parts[6].accesses, a.parts[6].total_bytes_accessed, a.parts[6].unique_bytes_accessed) == (2, 7, 5)
+
+	total = counters.total_stats
+	assert (total.accesses, total.total_bytes_accessed, total.unique_bytes_accessed) == (3, 40, 28)
+	assert len(counters.files_stats) == 2
+
+	counters.reset()
+	assert len(counters.files_stats) == 0
+	assert counters.total_stats.accesses == 0
+
+def test_cache_total_stats_rates() -> None:
+	total = CacheTotalStats()
+	assert (total.byte_hit_rate, total.byte_miss_rate) == (0.0, 0.0)
+
+	total.total_bytes_accessed = 8
+	total.bytes_hit = 2
+	total.bytes_missed = 6
+	assert (total.byte_hit_rate, total.byte_miss_rate) == (0.25, 0.75)
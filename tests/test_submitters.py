@@ -0,0 +1,30 @@
+from typing import Iterator, List
+
+from simulator.workload import Job, Submitter
+from simulator.workload.submitters import CallbackWrapSubmitter
+
+class _ListSubmitter(Submitter):
+	def __init__(self, jobs: List[Job], calls: List[str]) -> None:
+		super(_ListSubmitter, self).__init__(0)
+		self._jobs: List[Job] = jobs
+		self._calls: List[str] = calls
+
+	def __iter__(self) -> Iterator[Job]:
+		for job in self._jobs:
+			self._calls.append('job')
+			yield job
+
+def test_callback_wrap_submitter() -> None:
+	calls: List[str] = []
+	jobs = [Job(0, []), Job(1, [])]
+
+	it = iter(CallbackWrapSubmitter(
+		_ListSubmitter(jobs, calls),
+		pre_cb = lambda: calls.append('pre'),
+		post_cb = lambda: calls.append('post'),
+	))
+	# Callbacks are only called when iterating
+	assert calls == []
+
+	assert list(it) == jobs
+	assert calls == ['pre', 'job', 'job', 'post']
@@ -1,3 +1,7 @@
+from typing import Any, Iterable, Optional
 
 class ValidationError(Exception):
 	...
+
+def best_match(errors: Iterable[ValidationError], key: Any=...) -> Optional[ValidationError]:
+	...
@@ -0,0 +1,4 @@
+from typing import Any, Type
+
+def validator_for(schema: Any, default: Any=...) -> Type[Any]:
+	...